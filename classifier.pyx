@@ -0,0 +1,239 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+Compiled line classifier
+
+Native versions of the line classification loops of
+LLMCodeAnalyzer.analyze_code_impact and analyze_batch, used by
+llm_code_analyzer when this module has been built (see setup.sh). ASCII
+lines are matched directly against the comment, log and logical code
+patterns of llm_code_analyzer, with the same results as the regexes;
+other lines go to the Python classifier, which handles Unicode word
+characters and case folding.
+
+The matchers are written by hand for the pattern tables recorded in
+PATTERNS_HASH; llm_code_analyzer does not use this module when its tables
+hash differently, so edit both together.
+"""
+
+cdef extern from "Python.h":
+    bint PyUnicode_IS_ASCII(object o)
+    Py_ssize_t PyUnicode_GET_LENGTH(object o)
+    const unsigned char *PyUnicode_1BYTE_DATA(object o)
+
+# llm_code_analyzer._patterns_hash() of the tables implemented below
+PATTERNS_HASH = '1a08391d781a03821f79fc27d8d11f5fbb005d891f8fc8ca34963abaa4385687'
+
+# Line classes and content bits, as in llm_code_analyzer
+cdef int LINE_COMMENT = 1
+cdef int LINE_LOG = 2
+cdef int LINE_LOGICAL = 4
+cdef int LINE_DEF = 8
+cdef int LINE_CLASS_DEF = 16
+cdef int LINE_IMPORT = 32
+cdef int LINE_TEST = 64
+cdef int LINE_CONTENTS_DONE = 8 | 16 | 32 | 64
+
+
+cdef inline bint is_space(unsigned char c) noexcept nogil:
+    # ASCII characters matched by Python's \s and stripped by str.lstrip
+    return c == 32 or 9 <= c <= 13 or 28 <= c <= 31
+
+
+cdef inline bint is_word(unsigned char c) noexcept nogil:
+    # ASCII characters matched by Python's \w
+    return (b'a' <= c <= b'z' or b'A' <= c <= b'Z' or b'0' <= c <= b'9'
+            or c == b'_')
+
+
+cdef inline unsigned char lower(unsigned char c) noexcept nogil:
+    return c | 0x20 if b'A' <= c <= b'Z' else c
+
+
+cdef inline Py_ssize_t match_word(const unsigned char *s, Py_ssize_t n, Py_ssize_t i,
+                                  const char *word) noexcept nogil:
+    """End of the lowercase word matched case-insensitively at i, or -1."""
+    cdef Py_ssize_t j = 0
+    while word[j]:
+        if i + j >= n or lower(s[i + j]) != <unsigned char>word[j]:
+            return -1
+        j += 1
+    return i + j
+
+
+cdef inline bint match_exact(const unsigned char *s, Py_ssize_t n, Py_ssize_t i,
+                             const char *word) noexcept nogil:
+    """Whether word occurs at i (case-sensitive)."""
+    cdef Py_ssize_t j = 0
+    while word[j]:
+        if i + j >= n or s[i + j] != <unsigned char>word[j]:
+            return False
+        j += 1
+    return True
+
+
+cdef inline bint followed_by(const unsigned char *s, Py_ssize_t n, Py_ssize_t i,
+                             const char *token) noexcept nogil:
+    """Whether optional whitespace and then token follow position i."""
+    if i < 0:
+        return False
+    while i < n and is_space(s[i]):
+        i += 1
+    return match_word(s, n, i, token) >= 0
+
+
+cdef bint is_log(const unsigned char *s, Py_ssize_t n) noexcept nogil:
+    """Whether the line contains one of llm_code_analyzer._LOG_PATTERNS."""
+    cdef Py_ssize_t i, end
+    for i in range(n):
+        if (i > 0 and is_word(s[i - 1])) or not is_word(s[i]):
+            continue
+        if (followed_by(s, n, match_word(s, n, i, b'print'), b'(')
+                or followed_by(s, n, match_word(s, n, i, b'printf'), b'(')
+                or followed_by(s, n, match_word(s, n, i, b'fprintf'), b'(')
+                or followed_by(s, n, match_word(s, n, i, b'cout'), b'<<')
+                or followed_by(s, n, match_word(s, n, i, b'cerr'), b'<<')
+                or match_word(s, n, i, b'logger.') >= 0
+                or match_word(s, n, i, b'logging.') >= 0
+                or match_word(s, n, i, b'log.') >= 0
+                or match_word(s, n, i, b'system.out.print') >= 0
+                or match_word(s, n, i, b'system.err.print') >= 0):
+            return True
+        end = match_word(s, n, i, b'console.')
+        if end >= 0 and (followed_by(s, n, match_word(s, n, end, b'log'), b'(')
+                         or followed_by(s, n, match_word(s, n, end, b'debug'), b'(')
+                         or followed_by(s, n, match_word(s, n, end, b'info'), b'(')
+                         or followed_by(s, n, match_word(s, n, end, b'warn'), b'(')
+                         or followed_by(s, n, match_word(s, n, end, b'error'), b'(')):
+            return True
+    return False
+
+
+cdef bint is_logical(const unsigned char *s, Py_ssize_t n) noexcept nogil:
+    """Whether the line contains one of llm_code_analyzer._LOGICAL_PATTERNS."""
+    cdef Py_ssize_t i
+    cdef unsigned char c
+    for i in range(n):
+        c = s[i]
+        # Every pattern but assignments and calls contains a letter or an
+        # underscore; those two also match a number before '=' or '('
+        if is_word(c) and not b'0' <= c <= b'9':
+            return True
+        if b'0' <= c <= b'9' and (followed_by(s, n, i + 1, b'=') or followed_by(s, n, i + 1, b'(')):
+            return True
+    return False
+
+
+cdef int classify_ascii(const unsigned char *s, Py_ssize_t n) noexcept nogil:
+    """Classify an ASCII line (see LLMCodeAnalyzer._classify_line)."""
+    cdef Py_ssize_t start = 0
+    while start < n and is_space(s[start]):
+        start += 1
+    if start == n:
+        return 0
+    s += start
+    n -= start
+
+    # Same prefixes as llm_code_analyzer._COMMENT_PREFIXES
+    if (s[0] == b'#' or s[0] == b'*' or match_word(s, n, 0, b'//') >= 0
+            or match_word(s, n, 0, b'/*') >= 0 or match_word(s, n, 0, b'<!--') >= 0
+            or match_word(s, n, 0, b'"""') >= 0 or match_word(s, n, 0, b"'''") >= 0):
+        return LINE_COMMENT
+    if is_log(s, n):
+        return LINE_LOG
+    if is_logical(s, n):
+        return LINE_LOGICAL
+    return 0
+
+
+cdef int ascii_contents(const unsigned char *s, Py_ssize_t n, int found) noexcept nogil:
+    """
+    Add the content bits of an ASCII line, matching the markers of
+    llm_code_analyzer._CONTENT_MARKERS and _TEST_MARKERS.
+    """
+    cdef Py_ssize_t start = 0, end = n, i
+    cdef unsigned char c
+    while start < end and is_space(s[start]):
+        start += 1
+    while end > start and is_space(s[end - 1]):
+        end -= 1
+
+    # One pass over the stripped line, checking the words that can start
+    # at each character
+    for i in range(start, end):
+        c = s[i]
+        if c == b'd':
+            if not found & LINE_DEF and match_exact(s, end, i, b'def '):
+                found |= LINE_DEF
+        elif c == b'f':
+            if not found & LINE_DEF and match_exact(s, end, i, b'function '):
+                found |= LINE_DEF
+            elif not found & LINE_IMPORT and match_exact(s, end, i, b'from '):
+                found |= LINE_IMPORT
+        elif c == b'c':
+            if not found & LINE_CLASS_DEF and match_exact(s, end, i, b'class '):
+                found |= LINE_CLASS_DEF
+        elif c == b'i':
+            if not found & LINE_IMPORT and match_exact(s, end, i, b'import '):
+                found |= LINE_IMPORT
+        elif c == b't' or c == b'T' or c == b'a' or c == b'A':
+            if not found & LINE_TEST and (match_word(s, end, i, b'test') >= 0
+                                          or match_word(s, end, i, b'assert') >= 0):
+                found |= LINE_TEST
+    return found
+
+
+def count_line_classes(list lines, classify_line, line_contents):
+    """
+    Count the comment, log and logical code lines of a diff, and combine
+    their content bits (see llm_code_analyzer._count_line_classes).
+
+    Args:
+        lines: Added lines of the diff
+        classify_line: Python classifier used for non-ASCII lines
+        line_contents: Python content check used for non-ASCII lines
+
+    Returns:
+        Tuple of (comment_count, print_debug_count, logical_code_count,
+        contents)
+    """
+    cdef Py_ssize_t comment_count = 0, print_debug_count = 0, logical_code_count = 0
+    cdef int line_class, contents = 0
+    cdef bint is_ascii
+    cdef str line
+    for line in lines:
+        is_ascii = PyUnicode_IS_ASCII(line)
+        if contents != LINE_CONTENTS_DONE:
+            if is_ascii:
+                contents = ascii_contents(PyUnicode_1BYTE_DATA(line), PyUnicode_GET_LENGTH(line), contents)
+            elif line:
+                contents = line_contents(line, contents)
+        if is_ascii:
+            line_class = classify_ascii(PyUnicode_1BYTE_DATA(line), PyUnicode_GET_LENGTH(line))
+        else:
+            line_class = classify_line(line)
+        if line_class == LINE_COMMENT:
+            comment_count += 1
+        elif line_class == LINE_LOG:
+            print_debug_count += 1
+        elif line_class == LINE_LOGICAL:
+            logical_code_count += 1
+    return comment_count, print_debug_count, logical_code_count, contents
+
+
+def classify_lines(list lines, classify_line, unsigned char[::1] out):
+    """
+    Classify many lines into an array.
+
+    Args:
+        lines: Added lines of one or more diffs
+        classify_line: Python classifier used for non-ASCII lines
+        out: Array receiving the class of each line
+    """
+    cdef Py_ssize_t i
+    cdef str line
+    for i in range(len(lines)):
+        line = lines[i]
+        if PyUnicode_IS_ASCII(line):
+            out[i] = classify_ascii(PyUnicode_1BYTE_DATA(line), PyUnicode_GET_LENGTH(line))
+        else:
+            out[i] = classify_line(line)
@@ -9,27 +9,250 @@ This module analyzes git commits to measure contributor value based on:
 - Value: Actual impact vs churn ratio
 """
 
+import multiprocessing
 import os
 import re
+import sqlite3
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
-from collections import defaultdict
-from typing import Dict, List, Tuple
+from collections import OrderedDict
+from itertools import islice
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
-from git import Repo
-from dateutil.relativedelta import relativedelta
 from llm_code_analyzer import LLMCodeAnalyzer
 
+if TYPE_CHECKING:
+    # GitPython is imported when an analyzer is created, so importing this
+    # module for its scoring functions stays cheap
+    from git import Commit
+
+try:
+    # Optional: author scores are computed as array operations
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    # Optional: native per-author score kernels, built from kernels.pyx by setup.sh
+    import kernels as _compiled_kernels
+except ImportError:
+    _compiled_kernels = None
+
+
+# Keywords indicating meaningful work in a commit message, matched as
+# case-insensitive substrings in a single scan
+_MEANINGFUL_KEYWORDS_RE = re.compile(
+    'fix|add|update|implement|refactor|improve|optimize|feature|bug|issue',
+    re.IGNORECASE
+)
+
+# Commit message length bounds used by the quality check
+_GOOD_MESSAGE_MIN_LEN = 20
+_GOOD_MESSAGE_MAX_LEN = 200
+_SHORT_MESSAGE_MIN_LEN = 10
+
+
+def _base_scores(commits, lines_added, lines_deleted, files_modified, complexity,
+                 avg_message_quality):
+    """
+    Unrounded quality and difficulty scores of all authors.
+    
+    Array version of calculate_quality_score and calculate_difficulty_score.
+    Authors without commits score 0.
+    """
+    has_commits = commits > 0
+    safe_commits = np.where(has_commits, commits, 1)
+    
+    # Quality: balanced changes and meaningful commit messages
+    total_changes = lines_added + lines_deleted
+    net_changes = np.abs(lines_added - lines_deleted)
+    churn_ratio = np.where(
+        total_changes > 0, 1 - net_changes / np.where(total_changes > 0, total_changes, 1), 1.0
+    )
+    quality = churn_ratio * 40 + avg_message_quality * 60
+    
+    # Difficulty: files, complexity and lines changed per commit
+    files_score = np.minimum(files_modified / safe_commits * 10, 40.0)
+    complexity_score = np.minimum(complexity / safe_commits * 10, 40.0)
+    lines_score = np.minimum(total_changes / safe_commits / 10, 20.0)
+    difficulty = files_score + complexity_score + lines_score
+    
+    return np.where(has_commits, quality, 0.0), np.where(has_commits, difficulty, 0.0)
+
+
+def _value_scores(commits, lines_added, lines_deleted, quality, difficulty):
+    """
+    Unrounded value scores of all authors from their rounded quality and
+    difficulty scores. Array version of calculate_value_score.
+    """
+    # Net contribution and frequency, adjusted by quality
+    contribution_score = np.minimum(np.maximum((lines_added - lines_deleted) / 100, 0.0), 30.0)
+    frequency_score = np.minimum(commits * 2, 30)
+    quality_factor = np.where(quality > 0, quality / 100, 0.5)
+    value = (contribution_score + frequency_score) * (0.5 + quality_factor * 0.5)
+    # Bonus for tackling difficult work
+    value = np.where(difficulty > 50, value * 1.2, value)
+    return np.where(commits > 0, np.minimum(value, 100.0), 0.0)
+
+
+# Author count from which JIT-compiling the score kernels pays off. Below it,
+# importing Numba and dispatching to compiled code costs more than it saves
+_JIT_MIN_AUTHORS = 1000000
+
+# (base, value) score kernels compiled with Numba, once first needed
+_jit_score_kernels = None
+
+
+def _score_kernels(num_authors: int):
+    """
+    Get the score kernels to use for the given number of authors.
+    
+    Large inputs use Numba-compiled kernels (parallel loops over authors)
+    when Numba is installed; otherwise the kernels run as NumPy code.
+    """
+    global _jit_score_kernels
+    if num_authors < _JIT_MIN_AUTHORS:
+        return _base_scores, _value_scores
+    
+    if _jit_score_kernels is None:
+        try:
+            import numba
+        except ImportError:
+            _jit_score_kernels = (_base_scores, _value_scores)
+        else:
+            # No fastmath: scores must stay identical to the scalar versions
+            jit = numba.njit(parallel=True, cache=True)
+            _jit_score_kernels = (jit(_base_scores), jit(_value_scores))
+    return _jit_score_kernels
+
+
+# Analyzer owned by a worker process of the analysis pool (see analyze_repository)
+_worker_analyzer = None
+
+
+def _init_worker(repo_path: str):
+    """Open a dedicated repository handle for this worker process."""
+    global _worker_analyzer
+    _worker_analyzer = CommitAnalyzer(repo_path)
+    # The parent process reports a model that cannot be initialized, once
+    # rather than once per worker
+    _worker_analyzer.llm_analyzer.quiet = True
+
+
+def _analyze_commit_worker(job: Tuple[str, Optional[Dict]]) -> Tuple[str, Dict, float, bool]:
+    """
+    Analyze one commit inside a worker process.
+    
+    Args:
+        job: Tuple of (commit SHA, precomputed numstat or None)
+    
+    Returns:
+        Tuple of (author name, commit stats, message quality, whether the
+        stats are complete)
+    """
+    sha, numstat = job
+    commit = _worker_analyzer.repo.commit(sha)
+    stats, complete = _worker_analyzer._analyze_commit(commit, numstat=numstat)
+    msg_quality = _worker_analyzer.analyze_commit_message_quality(commit.message)
+    return commit.author.name, stats, msg_quality, complete
+
+
+def _batched(iterable: Iterable, size: int) -> Iterator[List]:
+    """Yield successive lists of up to size items from an iterable."""
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+class _AuthorStats:
+    """Running per-author totals accumulated by analyze_repository."""
+    
+    __slots__ = (
+        'commit_count', 'lines_added', 'lines_deleted', 'files_modified',
+        'complexity_score', 'msg_q_sum', 'msg_q_count',
+        'logical_impact_sum', 'meaningful_score_sum', 'comment_ratio_sum',
+        'print_ratio_sum', 'message_match_sum', 'mismatch_warnings'
+    )
+    
+    def __init__(self):
+        self.commit_count = 0
+        self.lines_added = 0
+        self.lines_deleted = 0
+        self.files_modified = 0
+        self.complexity_score = 0
+        self.msg_q_sum = 0.0
+        self.msg_q_count = 0
+        # LLM analysis sums; every commit contributes one value to each
+        self.logical_impact_sum = 0.0
+        self.meaningful_score_sum = 0.0
+        self.comment_ratio_sum = 0.0
+        self.print_ratio_sum = 0.0
+        self.message_match_sum = 0.0
+        self.mismatch_warnings = []
+    
+    def to_dict(self) -> Dict:
+        """Convert the totals to the author statistics dictionary, with averages."""
+        commits = self.commit_count
+        return {
+            'commit_count': commits,
+            'lines_added': self.lines_added,
+            'lines_deleted': self.lines_deleted,
+            'files_modified': self.files_modified,
+            'complexity_score': self.complexity_score,
+            'mismatch_warnings': self.mismatch_warnings,
+            'avg_message_quality': self.msg_q_sum / self.msg_q_count if self.msg_q_count else 0.5,
+            'avg_logical_impact': self.logical_impact_sum / commits if commits else 0.0,
+            'avg_meaningful_score': self.meaningful_score_sum / commits if commits else 0.0,
+            'avg_comment_ratio': self.comment_ratio_sum / commits if commits else 0.0,
+            'avg_print_ratio': self.print_ratio_sum / commits if commits else 0.0,
+            'avg_message_match': self.message_match_sum / commits if commits else 0.5,
+        }
+
 
 class CommitAnalyzer:
     """Analyzes git commits and calculates contributor metrics."""
     
-    def __init__(self, repo_path: str):
+    # Complexity weight per file extension: core source files weigh more
+    # than configuration files, anything else adds nothing
+    _EXT_COMPLEXITY = {
+        '.py': 2, '.java': 2, '.cpp': 2, '.c': 2, '.h': 2, '.js': 2, '.ts': 2,
+        '.json': 1, '.xml': 1, '.yaml': 1, '.yml': 1,
+    }
+    
+    # Version of the per-commit results stored in the cache database. Bump it
+    # whenever the analysis changes so results of older versions are dropped
+    _CACHE_VERSION = 7
+    
+    # Maximum number of SHAs per cache lookup (SQLite limits bound parameters)
+    _CACHE_QUERY_CHUNK = 500
+    
+    # Maximum number of cached commit diff results (line counts and analysis
+    # results; the diff text itself is not kept)
+    _DIFF_CACHE_SIZE = 4096
+    
+    # Number of commits read from history and analyzed at a time
+    _ANALYSIS_BATCH_SIZE = 2000
+    
+    def __init__(self, repo_path: str, build_commit_graph: bool = False,
+                 use_cache: bool = False, cache_dir: Optional[str] = None):
         """
         Initialize the analyzer with a git repository.
         
         Args:
             repo_path: Path to the git repository
+            build_commit_graph: Write a commit-graph file if the repository has
+                                none, so history walks can skip decoding commits
+            use_cache: Store per-commit results in a SQLite database so later
+                       runs only analyze new commits
+            cache_dir: Directory of the cache database
+                       (default: ~/.cache/git-tracker)
         """
+        from git import Repo
+        
         self.repo_path = repo_path
         try:
             self.repo = Repo(repo_path)
@@ -39,10 +262,259 @@ class CommitAnalyzer:
         if self.repo.bare:
             raise ValueError(f"Repository at {repo_path} is bare")
         
+        if build_commit_graph and not self.has_commit_graph():
+            try:
+                self.repo.git.commit_graph('write', '--reachable')
+            except Exception:
+                # Older git versions have no commit-graph support; walks still work
+                pass
+        
         # Initialize LLM analyzer for semantic code analysis
         # use_llm=True enables full transformer model support
         # Using mistral-7b-instruct for enhanced code understanding
         self.llm_analyzer = LLMCodeAnalyzer(use_llm=True, model_name="mistralai/Mistral-7B-Instruct-v0.2")
+        
+        # Optional libgit2 handle on the same repository, used to walk history
+        # and opened by the first walk (see _open_pygit2_repo). Diffs always
+        # come from git: libgit2's rename detection pairs files differently
+        # from git's -M, changing the counts and the diff text
+        self._pygit2_repo = None
+        self._pygit2_checked = False
+        
+        # Diff summaries keyed by (parent tree SHA, commit tree SHA), in LRU order
+        self._diff_cache: OrderedDict = OrderedDict()
+        
+        # Per-commit results of earlier runs (commit SHAs are immutable)
+        self._cache = self._open_cache(cache_dir) if use_cache else None
+    
+    def _open_cache(self, cache_dir: Optional[str] = None) -> Optional[sqlite3.Connection]:
+        """
+        Open (and create if needed) the commit cache database of this repository.
+        
+        Returns:
+            The database connection, or None if the cache cannot be used
+        """
+        if cache_dir is None:
+            cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+            cache_dir = os.path.join(cache_home, 'git-tracker')
+        repo_name = os.path.basename(os.path.abspath(self.repo.working_tree_dir))
+        
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            conn = sqlite3.connect(os.path.join(cache_dir, f'{repo_name}.sqlite'))
+            # Cached results can always be re-derived, so full durability is not needed
+            conn.execute('PRAGMA synchronous=NORMAL')
+            if conn.execute('PRAGMA user_version').fetchone()[0] != self._CACHE_VERSION:
+                conn.execute('DROP TABLE IF EXISTS commit_stats')
+                conn.execute(f'PRAGMA user_version = {self._CACHE_VERSION}')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS commit_stats ('
+                'sha TEXT PRIMARY KEY, author TEXT, '
+                'lines_added INT, lines_deleted INT, files_modified INT, complexity_score INT, '
+                'msg_quality REAL, logical_impact REAL, comment_ratio REAL, '
+                'print_debug_ratio REAL, meaningful_score REAL, commit_message_match REAL, '
+                'mismatch_warning TEXT)'
+            )
+            conn.commit()
+            return conn
+        except (OSError, sqlite3.Error):
+            # The cache only saves time; analyze without it
+            return None
+    
+    def _load_cached_commits(self, shas: List[str]) -> Dict[str, Tuple[str, Dict, float]]:
+        """
+        Look up cached results for the given commits.
+        
+        Returns:
+            Dictionary mapping commit SHAs to (author name, commit stats,
+            message quality) for the commits found in the cache
+        """
+        cached = {}
+        try:
+            for start in range(0, len(shas), self._CACHE_QUERY_CHUNK):
+                chunk = shas[start:start + self._CACHE_QUERY_CHUNK]
+                rows = self._cache.execute(
+                    'SELECT sha, author, lines_added, lines_deleted, files_modified, '
+                    'complexity_score, msg_quality, logical_impact, comment_ratio, '
+                    'print_debug_ratio, meaningful_score, commit_message_match, mismatch_warning '
+                    f'FROM commit_stats WHERE sha IN ({",".join("?" * len(chunk))})',
+                    chunk
+                )
+                for row in rows:
+                    stats = {
+                        'lines_added': row[2],
+                        'lines_deleted': row[3],
+                        'files_modified': row[4],
+                        'complexity_score': row[5],
+                        'llm_analysis': {
+                            'logical_impact': row[7],
+                            'comment_ratio': row[8],
+                            'print_debug_ratio': row[9],
+                            'meaningful_score': row[10],
+                            'commit_message_match': row[11],
+                            'mismatch_warning': row[12]
+                        }
+                    }
+                    cached[row[0]] = (row[1], stats, row[6])
+        except sqlite3.Error:
+            # Unreadable cache: analyze everything again
+            return {}
+        return cached
+    
+    def _store_cached_commits(self, analyzed: List[Tuple[str, Tuple[str, Dict, float]]]):
+        """
+        Store freshly analyzed commits in the cache.
+        
+        Args:
+            analyzed: (commit SHA, (author name, commit stats, message
+                      quality)) of each commit
+        """
+        rows = []
+        for sha, (author, stats, msg_quality) in analyzed:
+            llm_data = stats['llm_analysis']
+            rows.append((
+                sha, author,
+                stats['lines_added'], stats['lines_deleted'],
+                stats['files_modified'], stats['complexity_score'],
+                msg_quality, llm_data['logical_impact'], llm_data['comment_ratio'],
+                llm_data['print_debug_ratio'], llm_data['meaningful_score'],
+                llm_data['commit_message_match'], llm_data['mismatch_warning']
+            ))
+        try:
+            self._cache.executemany(
+                'INSERT OR IGNORE INTO commit_stats VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                rows
+            )
+            self._cache.commit()
+        except sqlite3.Error:
+            # Not fatal: these commits are simply analyzed again next time
+            pass
+    
+    def has_commit_graph(self) -> bool:
+        """
+        Check whether the repository has a commit-graph file.
+        
+        The commit-graph stores parents and commit times, letting git walk
+        history without inflating every commit object.
+        """
+        info_dir = os.path.join(self.repo.common_dir, 'objects', 'info')
+        return (os.path.isfile(os.path.join(info_dir, 'commit-graph'))
+                or os.path.isdir(os.path.join(info_dir, 'commit-graphs')))
+    
+    @staticmethod
+    def _window_start(months: int) -> Optional[datetime]:
+        """Oldest commit date in a window of the given months (None for all commits)."""
+        if months == 0:
+            return None
+        from dateutil.relativedelta import relativedelta
+        return datetime.now() - relativedelta(months=months)
+    
+    def _lazy_commit(self, sha: str) -> 'Commit':
+        """GitPython commit for a SHA whose data is only read when accessed."""
+        from git import Commit
+        return Commit(self.repo, bytes.fromhex(sha))
+    
+    def _open_pygit2_repo(self):
+        """
+        libgit2 handle on the repository, or None if pygit2 is not installed
+        or cannot open it (history is then walked with git log).
+        
+        pygit2 is only imported here, so importing this module and starting
+        a worker process do not pay for it.
+        """
+        if not self._pygit2_checked:
+            self._pygit2_checked = True
+            try:
+                # Optional: libgit2 walks history without a git subprocess
+                import pygit2
+                self._pygit2_repo = pygit2.Repository(self.repo.git_dir)
+            except Exception:
+                # Not installed or unreadable: fall back to git log
+                self._pygit2_repo = None
+        return self._pygit2_repo
+    
+    def _enumerate_commit_metadata(self, since: Optional[datetime] = None) -> Iterator[Tuple[str, int, str]]:
+        """
+        Iterate over commits as (SHA, committer timestamp, author name),
+        newest first, without building commit objects.
+        
+        Deciding which commits are in the window is kept apart from analyzing
+        them, so commits that are never analyzed (e.g. cached ones) are not
+        read beyond these fields.
+        
+        Args:
+            since: Oldest commit date to include (None for all commits)
+        """
+        pygit2_repo = self._open_pygit2_repo()
+        if pygit2_repo is not None:
+            from pygit2 import GIT_SORT_TIME
+            
+            # Walk history in-process with libgit2. Commit times are whole
+            # epoch seconds, so the cutoff is one too (git's --since compares
+            # the same way) and each commit costs a single integer comparison
+            cutoff_ts = int(since.timestamp()) if since is not None else -(1 << 63)
+            walker = pygit2_repo.walk(pygit2_repo.head.target, GIT_SORT_TIME)
+            for pygit2_commit in walker:
+                if pygit2_commit.commit_time < cutoff_ts:
+                    # Commits are in reverse chronological order
+                    break
+                yield str(pygit2_commit.id), pygit2_commit.commit_time, pygit2_commit.author.name
+            return
+        
+        # git applies the date filter during the walk, so older commits are
+        # never returned
+        args = ['--pretty=format:%H%x09%ct%x09%an']
+        if since is not None:
+            args += ['--since', since.isoformat()]
+        
+        proc = self.repo.git.log(*args, as_process=True)
+        read_all = False
+        try:
+            for raw_line in proc.stdout:
+                sha, timestamp, author = raw_line.decode('utf-8', errors='replace').rstrip('\n').split('\t', 2)
+                yield sha, int(timestamp), author
+            read_all = True
+        finally:
+            self._end_git_process(proc, read_all)
+    
+    @staticmethod
+    def _end_git_process(proc, read_all: bool):
+        """
+        Close a git process whose output was streamed.
+        
+        Args:
+            proc: The process, as returned by an ``as_process=True`` call
+            read_all: Whether all of its output was read. Only then is the
+                      exit status checked (raising GitCommandError on failure);
+                      otherwise git is terminated, and the exit caused by the
+                      signal or by writing to the closed pipe is expected
+        """
+        if read_all:
+            proc.stdout.close()
+            proc.wait()
+            return
+        
+        popen = proc.proc
+        popen.terminate()
+        for stream in (popen.stdin, popen.stdout, popen.stderr):
+            if stream is not None:
+                try:
+                    stream.close()
+                except OSError:
+                    # Unflushed input to a process that exited
+                    pass
+        popen.wait()
+    
+    def iter_commits_in_window(self, months: int = 1) -> Iterator['Commit']:
+        """
+        Iterate over the commits from the specified number of months, newest
+        first, reading history only as far as the caller consumes it.
+        
+        Args:
+            months: Number of months to look back (0 for all commits)
+        """
+        for sha, _, _ in self._enumerate_commit_metadata(self._window_start(months)):
+            yield self._lazy_commit(sha)
     
     def get_commits_last_month(self, months: int = 1) -> List:
         """
@@ -51,34 +523,233 @@ class CommitAnalyzer:
         Args:
             months: Number of months to look back (0 for all commits)
         """
-        commits = []
+        return list(self.iter_commits_in_window(months=months))
+    
+    def _collect_numstat(self, shas: List[str]) -> Dict[str, Dict]:
+        """
+        Collect line/file statistics for the given commits with a single
+        ``git log --numstat`` run.
         
-        if months == 0:
-            # Get all commits
-            for commit in self.repo.iter_commits():
-                commits.append(commit)
+        Git computes the added/deleted counts itself, so no patch text has to
+        be generated or scanned in Python just to count lines.
+        
+        Args:
+            shas: SHAs of the commits (e.g. one analysis batch)
+        
+        Returns:
+            Dictionary mapping commit SHAs to lines_added, lines_deleted,
+            files_modified and complexity_score. Commits without an entry
+            (all of them on git older than 2.31, which cannot diff merges
+            against their first parent here) are counted from their own diff.
+        """
+        if not shas or self.repo.git.version_info < (2, 31):
+            return {}
+        
+        args = [
+            '--numstat',
+            '--format=commit%x00%H',
+            # Diff merges against their first parent, like analyze_commit does
+            '--diff-merges=first-parent',
+            '-M',
+            # Only the commits read from stdin, without walking their history
+            '--no-walk=unsorted',
+            '--stdin',
+        ]
+        
+        # Boundary commits of a shallow clone are diffed as if they had no
+        # parent, crediting them with the whole tree; analyze_commit leaves
+        # their counts at zero instead
+        shallow = self._shallow_commits()
+        
+        numstat = {}
+        stats = None
+        # Non-ASCII paths are printed as they are instead of C-quoted
+        proc = self.repo.git(c='core.quotePath=false').log(*args, as_process=True, istream=subprocess.PIPE)
+        read_all = False
+        try:
+            # git reads all of stdin before it prints anything
+            proc.stdin.write(''.join(f'{sha}\n' for sha in shas).encode('ascii'))
+            proc.stdin.close()
+            for raw_line in proc.stdout:
+                line = raw_line.decode('utf-8', errors='replace').rstrip('\n')
+                if line.startswith('commit\0'):
+                    if stats is not None and 1 <= stats['files_modified'] <= 3:
+                        stats['complexity_score'] += 1
+                    sha = line.split('\0', 2)[1]
+                    if sha in shallow:
+                        stats = None
+                        continue
+                    stats = numstat[sha] = {
+                        'lines_added': 0,
+                        'lines_deleted': 0,
+                        'files_modified': 0,
+                        'complexity_score': 0,
+                    }
+                    continue
+                
+                parts = line.split('\t', 2)
+                if stats is None or len(parts) != 3:
+                    continue
+                added, deleted, path = parts
+                stats['files_modified'] += 1
+                # Binary files are reported as "-\t-\tpath"
+                if added != '-':
+                    stats['lines_added'] += int(added)
+                    stats['lines_deleted'] += int(deleted)
+                stats['complexity_score'] += self._path_complexity(self._numstat_path(path))
+            
+            if stats is not None and 1 <= stats['files_modified'] <= 3:
+                stats['complexity_score'] += 1
+            read_all = True
+        finally:
+            self._end_git_process(proc, read_all)
+        
+        return numstat
+    
+    def _shallow_commits(self) -> Set[str]:
+        """SHAs of the commits whose parents are cut off in a shallow clone."""
+        try:
+            with open(os.path.join(self.repo.common_dir, 'shallow')) as f:
+                return set(f.read().split())
+        except OSError:
+            # Not a shallow clone
+            return set()
+    
+    @staticmethod
+    def _numstat_path(path: str) -> str:
+        """
+        Resolve the pre-image path of a numstat entry.
+        
+        Renames are reported as ``old => new`` or ``dir/{old => new}/file``;
+        the old path is used so results match ``Diff.a_path``. Paths with
+        quotes, backslashes or control characters are C-quoted (each side
+        of a rename separately).
+        """
+        if ' => ' in path:
+            if '{' in path:
+                path = re.sub(r'\{(.*?) => .*?\}', r'\1', path).replace('//', '/')
+            else:
+                path = path.split(' => ', 1)[0]
+        if path.startswith('"') and path.endswith('"'):
+            from git.diff import decode_path
+            path = decode_path(path.encode('utf-8'), has_ab_prefix=False).decode('utf-8', errors='replace')
+        return path
+    
+    @classmethod
+    def _path_complexity(cls, path: str) -> int:
+        """Complexity weight of a single modified file, based on its extension."""
+        return cls._EXT_COMPLEXITY.get(os.path.splitext(path)[1], 0)
+    
+    def _summarize_diff(self, commit, count_lines: bool = True) -> Optional[Dict]:
+        """
+        Diff a commit against its first parent.
+        
+        Args:
+            commit: The commit to diff
+            count_lines: Whether to count lines/files from the patch text
+        
+        Returns:
+            Dictionary with the concatenated diff_text and the line/file
+            counts (None unless count_lines is set), or None if the diff fails
+        """
+        # Patches keep git's default context: hunks diffed without context
+        # can align differently and change the counts
+        if commit.parents:
+            try:
+                diffs = commit.parents[0].diff(commit, create_patch=True)
+            except Exception:
+                # If diff fails (e.g., shallow clone missing parent commits, bad git objects)
+                # Skip this commit and continue with empty stats
+                # Common causes: GitCommandError, BadName, missing objects in shallow clones
+                return None
         else:
-            # Get commits from the last N months (using UTC for consistency)
-            cutoff_date = datetime.now() - relativedelta(months=months)
-            for commit in self.repo.iter_commits():
-                # Git commits use UTC timestamps
-                commit_date = datetime.fromtimestamp(commit.committed_date)
-                if commit_date >= cutoff_date:
-                    commits.append(commit)
-                else:
-                    # Commits are in reverse chronological order
-                    break
+            # First commit has no parent: diff against the empty tree
+            from git import NULL_TREE
+            try:
+                diffs = commit.diff(NULL_TREE, create_patch=True)
+            except Exception:
+                # If diff fails, skip this commit
+                return None
+        
+        counts = None
+        if count_lines:
+            counts = {
+                'lines_added': 0,
+                'lines_deleted': 0,
+                'files_modified': 0,
+                'complexity_score': 0,
+            }
         
-        return commits
+        # Collect all diff text for LLM analysis
+        diff_texts = []
+        # A type change (e.g. a file replaced by a symlink) is patched as a
+        # deletion and an addition of the same path, but is one modified file
+        seen_paths = set()
+        
+        for diff in diffs:
+            if diff.diff:
+                try:
+                    # Count lines added and deleted on the raw bytes: the
+                    # patch starts at the first hunk (GitPython strips the
+                    # file headers), so every "\n+" starts an added line and
+                    # every "\n-" a deleted one, including "++i;" or "-- note".
+                    # The leading newline makes the first line count too.
+                    if count_lines:
+                        patch = b'\n' + diff.diff
+                        counts['lines_added'] += patch.count(b'\n+')
+                        counts['lines_deleted'] += patch.count(b'\n-')
+                    
+                    diff_texts.append(diff.diff.decode('utf-8', errors='ignore'))
+                    diff_texts.append("\n")
+                except (UnicodeDecodeError, AttributeError, TypeError):
+                    # Skip diffs that can't be decoded properly
+                    # This can happen with binary files or unusual encodings
+                    pass
+            
+            # Calculate complexity based on file types and change patterns
+            # (added files only have a b_path)
+            path = diff.a_path or diff.b_path
+            if count_lines and path not in seen_paths:
+                seen_paths.add(path)
+                counts['files_modified'] += 1
+                if path:
+                    counts['complexity_score'] += self._path_complexity(path)
+        
+        # Higher complexity for smaller focused changes (likely bug fixes)
+        # Check this after all diffs are processed
+        if count_lines and 1 <= counts['files_modified'] <= 3:
+            counts['complexity_score'] += 1
+        
+        return {
+            'diff_text': "".join(diff_texts),
+            'counts': counts,
+        }
     
-    def analyze_commit(self, commit) -> Dict:
+    def analyze_commit(self, commit, numstat: Optional[Dict] = None) -> Dict:
         """
         Analyze a single commit for various metrics.
         
+        Args:
+            commit: The commit to analyze
+            numstat: Precomputed line/file statistics for this commit (as
+                     returned by _collect_numstat). When given, the diff is
+                     only used for semantic analysis.
+        
         Returns:
             Dictionary with lines_added, lines_deleted, files_modified, complexity_score,
             and LLM-based semantic analysis
         """
+        return self._analyze_commit(commit, numstat)[0]
+    
+    def _analyze_commit(self, commit, numstat: Optional[Dict] = None) -> Tuple[Dict, bool]:
+        """
+        Analyze a single commit (see analyze_commit).
+        
+        Returns:
+            Tuple of (commit stats, whether they are complete). Stats are
+            incomplete when the diff or its analysis failed and defaults were
+            used instead, so they must not be stored in the commit cache.
+        """
         stats = {
             'lines_added': 0,
             'lines_deleted': 0,
@@ -94,81 +765,89 @@ class CommitAnalyzer:
             }
         }
         
+        count_lines = numstat is None
+        
         try:
-            # Get commit diff stats
+            # Diff results are cached per (parent tree, commit tree) pair, so
+            # commits introducing an already diffed change between identical
+            # trees (e.g. rebased copies of a commit) reuse the earlier result
+            cache_key = None
             if commit.parents:
                 try:
-                    diffs = commit.parents[0].diff(commit, create_patch=True)
-                except Exception:
-                    # If diff fails (e.g., shallow clone missing parent commits, bad git objects)
-                    # Skip this commit and continue with empty stats
-                    # Common causes: GitCommandError, BadName, missing objects in shallow clones
-                    return stats
-            else:
-                # First commit has no parent
-                try:
-                    diffs = commit.diff(None, create_patch=True)
+                    parent_tree = commit.parents[0].tree
+                    commit_tree = commit.tree
                 except Exception:
-                    # If diff fails, skip this commit
-                    return stats
+                    # Missing objects, e.g. in shallow clones
+                    return stats, False
+                if parent_tree == commit_tree:
+                    # Metadata-only commit (e.g. an empty commit): nothing to diff
+                    return stats, True
+                cache_key = (parent_tree.hexsha, commit_tree.hexsha)
             
-            stats['files_modified'] = len(diffs)
+            # Only applied once the parent is known to exist, so commits
+            # whose parents are missing keep zero counts
+            if numstat is not None:
+                stats.update(numstat)
             
-            # Collect all diff text for LLM analysis
-            all_diff_text = ""
+            # Entries in the diff cache are always fully analyzed
+            analyzed = True
+            diff_summary = self._diff_cache.get(cache_key) if cache_key else None
+            if diff_summary is not None and count_lines and diff_summary['counts'] is None:
+                # Cached without line counts, which are needed now
+                diff_summary = None
             
-            for diff in diffs:
-                # Count lines added and deleted
-                if diff.diff:
+            if diff_summary is None:
+                diff = self._summarize_diff(commit, count_lines)
+                if diff is None:
+                    return stats, False
+                # Everything derived from the diff is computed now, so the
+                # diff text itself does not have to be kept
+                diff_summary = {
+                    'counts': diff['counts'],
+                    'impact_analysis': None,
+                    'change_analysis': None,
+                }
+                diff_text = diff['diff_text']
+                if diff_text:
                     try:
-                        diff_text = diff.diff.decode('utf-8', errors='ignore')
-                        all_diff_text += diff_text + "\n"
-                        
-                        lines = diff_text.split('\n')
-                        for line in lines:
-                            if line.startswith('+') and not line.startswith('+++'):
-                                stats['lines_added'] += 1
-                            elif line.startswith('-') and not line.startswith('---'):
-                                stats['lines_deleted'] += 1
-                    except (UnicodeDecodeError, AttributeError):
-                        # Skip diffs that can't be decoded properly
-                        # This can happen with binary files or unusual encodings
-                        pass
-                
-                # Calculate complexity based on file types and change patterns
-                if diff.a_path:
-                    path = diff.a_path
-                    # Higher complexity for core files
-                    if any(ext in path for ext in ['.py', '.java', '.cpp', '.c', '.js', '.ts']):
-                        stats['complexity_score'] += 2
-                    elif any(ext in path for ext in ['.json', '.xml', '.yaml', '.yml']):
-                        stats['complexity_score'] += 1
+                        # Perform LLM-based semantic analysis
+                        diff_summary['impact_analysis'] = self.llm_analyzer.analyze_code_impact(diff_text)
+                        diff_summary['change_analysis'] = self.llm_analyzer.analyze_change_type(diff_text)
+                    except Exception:
+                        # If LLM analysis fails for any reason, continue with default values
+                        # This ensures the tool remains functional even if analysis fails
+                        diff_summary['impact_analysis'] = None
+                        analyzed = False
+                if cache_key and analyzed:
+                    self._diff_cache[cache_key] = diff_summary
+                    if len(self._diff_cache) > self._DIFF_CACHE_SIZE:
+                        self._diff_cache.popitem(last=False)
+            else:
+                self._diff_cache.move_to_end(cache_key)
             
-            # Higher complexity for smaller focused changes (likely bug fixes)
-            # Check this after all diffs are processed
-            if 1 <= stats['files_modified'] <= 3:
-                stats['complexity_score'] += 1
+            if count_lines:
+                stats.update(diff_summary['counts'])
             
-            # Perform LLM-based semantic analysis
-            if all_diff_text:
+            impact_analysis = diff_summary['impact_analysis']
+            if impact_analysis is not None:
                 try:
-                    # Analyze code impact
-                    impact_analysis = self.llm_analyzer.analyze_code_impact(all_diff_text)
                     stats['llm_analysis']['logical_impact'] = impact_analysis['logical_impact']
                     stats['llm_analysis']['comment_ratio'] = impact_analysis['comment_ratio']
                     stats['llm_analysis']['print_debug_ratio'] = impact_analysis['print_debug_ratio']
                     stats['llm_analysis']['meaningful_score'] = impact_analysis['meaningful_score']
                     
                     # Verify commit message matches actual changes
-                    message_verification = self.llm_analyzer.verify_commit_message(
-                        commit.message, all_diff_text
+                    message_verification = self.llm_analyzer.verify_commit_message_against(
+                        commit.message, diff_summary['change_analysis']
                     )
                     stats['llm_analysis']['commit_message_match'] = message_verification['match_score']
                     stats['llm_analysis']['mismatch_warning'] = message_verification['mismatch_warning']
                 except Exception:
                     # If LLM analysis fails for any reason, continue with default values
                     # This ensures the tool remains functional even if analysis fails
-                    pass
+                    return stats, False
+            
+            return stats, analyzed
         
         except (ValueError, TypeError, AttributeError):
             # Handle git-specific exceptions that might occur during diff analysis
@@ -176,9 +855,7 @@ class CommitAnalyzer:
             # TypeError: Unexpected type in git operations  
             # AttributeError: Missing expected attributes in git objects
             # Continue with empty stats to allow analysis of other commits
-            pass
-        
-        return stats
+            return stats, False
     
     def calculate_quality_score(self, author_stats: Dict) -> float:
         """
@@ -280,6 +957,66 @@ class CommitAnalyzer:
         
         return round(min(value, 100), 2)
     
+    def _score_authors(self, author_stats: List[Dict]) -> None:
+        """
+        Calculate quality, difficulty and value scores for all authors at once.
+        
+        Array-based equivalent of calculate_quality_score,
+        calculate_difficulty_score and calculate_value_score (which remain
+        the reference implementation when NumPy is unavailable). Scores are
+        stored in each author's stats dictionary.
+        """
+        commits = np.array([s['commit_count'] for s in author_stats], dtype=np.int64)
+        lines_added = np.array([s['lines_added'] for s in author_stats], dtype=np.int64)
+        lines_deleted = np.array([s['lines_deleted'] for s in author_stats], dtype=np.int64)
+        files_modified = np.array([s['files_modified'] for s in author_stats], dtype=np.int64)
+        complexity = np.array([s['complexity_score'] for s in author_stats], dtype=np.int64)
+        avg_message_quality = np.array(
+            [s.get('avg_message_quality', 0.5) for s in author_stats], dtype=np.float64
+        )
+        base_scores, value_scores = _score_kernels(len(author_stats))
+        
+        quality, difficulty = base_scores(
+            commits, lines_added, lines_deleted, files_modified, complexity, avg_message_quality
+        )
+        # Value builds on the rounded quality and difficulty scores; round like
+        # the builtin round() does (np.round can differ in the last digit)
+        quality = np.array([round(q, 2) for q in quality.tolist()], dtype=np.float64)
+        difficulty = np.array([round(d, 2) for d in difficulty.tolist()], dtype=np.float64)
+        value = value_scores(commits, lines_added, lines_deleted, quality, difficulty)
+        
+        for stats, quality_score, difficulty_score, value_score in zip(
+            author_stats, quality.tolist(), difficulty.tolist(), value.tolist()
+        ):
+            stats['quality_score'] = quality_score
+            stats['difficulty_score'] = difficulty_score
+            stats['value_score'] = round(value_score, 2)
+    
+    def _score_author(self, stats: Dict) -> None:
+        """Calculate quality, difficulty and value scores for one author."""
+        stats['quality_score'] = self.calculate_quality_score(stats)
+        stats['difficulty_score'] = self.calculate_difficulty_score(stats)
+        stats['value_score'] = self.calculate_value_score(stats)
+    
+    @staticmethod
+    def _score_author_compiled(stats: Dict) -> None:
+        """
+        Calculate quality, difficulty and value scores for one author with
+        the compiled kernels (same results as the calculate_*_score methods).
+        """
+        commits = stats['commit_count']
+        lines_added = stats['lines_added']
+        lines_deleted = stats['lines_deleted']
+        quality = stats['quality_score'] = _compiled_kernels.quality_score(
+            commits, lines_added, lines_deleted, stats.get('avg_message_quality', 0.5)
+        )
+        difficulty = stats['difficulty_score'] = _compiled_kernels.difficulty_score(
+            commits, lines_added, lines_deleted, stats['files_modified'], stats['complexity_score']
+        )
+        stats['value_score'] = _compiled_kernels.value_score(
+            commits, lines_added, lines_deleted, quality, difficulty
+        )
+    
     def analyze_commit_message_quality(self, message: str) -> float:
         """
         Analyze commit message quality.
@@ -292,21 +1029,18 @@ class CommitAnalyzer:
         score = 0.5  # Base score
         
         # Length check (reasonable commit messages)
-        if 20 <= len(message) <= 200:
+        length = len(message)
+        if _GOOD_MESSAGE_MIN_LEN <= length <= _GOOD_MESSAGE_MAX_LEN:
             score += 0.2
-        elif len(message) > 10:
+        elif length > _SHORT_MESSAGE_MIN_LEN:
             score += 0.1
         
         # Contains keywords indicating meaningful work
-        meaningful_keywords = [
-            'fix', 'add', 'update', 'implement', 'refactor',
-            'improve', 'optimize', 'feature', 'bug', 'issue'
-        ]
-        if any(keyword in message.lower() for keyword in meaningful_keywords):
+        if _MEANINGFUL_KEYWORDS_RE.search(message) is not None:
             score += 0.2
         
-        # Not just merge commit
-        if not message.lower().startswith('merge'):
+        # Not just merge commit (only the prefix needs lowercasing)
+        if message[:5].lower() != 'merge':
             score += 0.1
         
         return min(score, 1.0)
@@ -336,117 +1070,167 @@ class CommitAnalyzer:
         else:
             return "Balanced contributor"
     
-    def analyze_repository(self, months: int = 1) -> Dict[str, Dict]:
+    def _add_commit_stats(self, author_stats: Dict[str, '_AuthorStats'], sha: str,
+                          author: str, stats: Dict, msg_quality: float):
+        """Add one analyzed commit to its author's running totals."""
+        totals = author_stats.get(author)
+        if totals is None:
+            totals = author_stats[author] = _AuthorStats()
+        
+        totals.commit_count += 1
+        totals.lines_added += stats['lines_added']
+        totals.lines_deleted += stats['lines_deleted']
+        totals.files_modified += stats['files_modified']
+        totals.complexity_score += stats['complexity_score']
+        totals.msg_q_sum += msg_quality
+        totals.msg_q_count += 1
+        
+        # Aggregate LLM analysis results
+        llm_data = stats.get('llm_analysis', {})
+        totals.logical_impact_sum += llm_data.get('logical_impact', 0.0)
+        totals.meaningful_score_sum += llm_data.get('meaningful_score', 0.0)
+        totals.comment_ratio_sum += llm_data.get('comment_ratio', 0.0)
+        totals.print_ratio_sum += llm_data.get('print_debug_ratio', 0.0)
+        totals.message_match_sum += llm_data.get('commit_message_match', 0.5)
+        
+        # Collect mismatch warnings
+        if llm_data.get('mismatch_warning'):
+            totals.mismatch_warnings.append({
+                'commit': sha[:7],
+                'message': self._lazy_commit(sha).message.split('\n')[0][:50],
+                'warning': llm_data.get('mismatch_warning')
+            })
+    
+    def _start_worker_pool(self, num_workers: int) -> ProcessPoolExecutor:
+        """
+        Start worker processes that each analyze commits from their own
+        repository handle.
+        
+        Args:
+            num_workers: Number of worker processes
+        """
+        # Warn here about a model that cannot be initialized; the workers
+        # fall back to the heuristics silently
+        self.llm_analyzer.model_available()
+        
+        # Workers are spawned (GitPython handles are not safe to share across
+        # a fork) and each opens its own repository
+        return ProcessPoolExecutor(
+            max_workers=num_workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker,
+            initargs=(self.repo_path,)
+        )
+    
+    def _analyze_commits(self, shas: List[str], numstat: Dict[str, Dict], num_workers: int = 1,
+                         executor: Optional[ProcessPoolExecutor] = None) -> List[Tuple[str, Dict, float, bool]]:
+        """
+        Analyze commits, in parallel when a worker pool is given.
+        
+        Args:
+            shas: SHAs of the commits to analyze
+            numstat: Precomputed line/file statistics keyed by commit SHA
+            num_workers: Number of processes in the worker pool
+            executor: Worker pool from _start_worker_pool (default: analyze
+                      in this process)
+        
+        Returns:
+            List of (author name, commit stats, message quality, whether the
+            stats are complete), in commit order
+        """
+        if executor is not None:
+            # Each commit is analyzed independently, so spread them over the workers
+            jobs = [(sha, numstat.get(sha)) for sha in shas]
+            return list(executor.map(
+                _analyze_commit_worker, jobs,
+                chunksize=max(1, len(jobs) // (num_workers * 4))
+            ))
+        
+        results = []
+        for commit in map(self._lazy_commit, shas):
+            stats, complete = self._analyze_commit(commit, numstat=numstat.get(commit.hexsha))
+            results.append((
+                commit.author.name, stats, self.analyze_commit_message_quality(commit.message), complete
+            ))
+        return results
+    
+    def analyze_repository(self, months: int = 1, num_workers: int = 1) -> Dict[str, Dict]:
         """
         Analyze the entire repository for the specified time period.
         
         Args:
             months: Number of months to analyze (0 for all commits)
+            num_workers: Number of worker processes used to analyze commits
+                         (default: 1, analyzing in this process). Workers
+                         are spawned, so scripts using more than one need an
+                         ``if __name__ == '__main__'`` guard, and they use
+                         their own LLMCodeAnalyzer rather than llm_analyzer
         
         Returns:
             Dictionary mapping author names to their statistics
         """
-        commits = self.get_commits_last_month(months=months)
+        author_stats: Dict[str, _AuthorStats] = {}
+        executor = None
+        
+        try:
+            # Commits are consumed in batches straight from the history walk,
+            # so only one batch is held at a time
+            commits = self._enumerate_commit_metadata(self._window_start(months))
+            for batch in _batched(commits, self._ANALYSIS_BATCH_SIZE):
+                shas = [sha for sha, _, _ in batch]
+                
+                # Reuse the results of commits analyzed by earlier runs
+                analyzed_by_sha = {}
+                if self._cache is not None:
+                    analyzed_by_sha = self._load_cached_commits(shas)
+                pending = [sha for sha in shas if sha not in analyzed_by_sha]
+                
+                if pending:
+                    # Line/file counts of the batch come from one git run
+                    # (also on incremental runs, so counts never depend on
+                    # what was cached)
+                    numstat = self._collect_numstat(pending)
+                    
+                    # The pool serves every later batch too, so it gets the
+                    # requested size even if this batch is small
+                    if executor is None and min(num_workers, len(pending)) > 1:
+                        executor = self._start_worker_pool(num_workers)
+                    
+                    # Only complete results are cached; failed analyses are
+                    # retried by the next run
+                    complete = []
+                    for sha, (author, stats, msg_quality, is_complete) in zip(
+                        pending, self._analyze_commits(pending, numstat, num_workers, executor)
+                    ):
+                        analyzed_by_sha[sha] = (author, stats, msg_quality)
+                        if is_complete:
+                            complete.append((sha, analyzed_by_sha[sha]))
+                    if self._cache is not None and complete:
+                        self._store_cached_commits(complete)
+                
+                for sha in shas:
+                    self._add_commit_stats(author_stats, sha, *analyzed_by_sha[sha])
+        finally:
+            if executor is not None:
+                executor.shutdown()
         
-        if not commits:
+        if not author_stats:
             return {}
         
-        # Aggregate statistics per author
-        author_stats = defaultdict(lambda: {
-            'commit_count': 0,
-            'lines_added': 0,
-            'lines_deleted': 0,
-            'files_modified': 0,
-            'complexity_score': 0,
-            'message_qualities': [],
-            'llm_logical_impacts': [],
-            'llm_meaningful_scores': [],
-            'llm_comment_ratios': [],
-            'llm_print_ratios': [],
-            'llm_message_matches': [],
-            'mismatch_warnings': []
-        })
-        
-        for commit in commits:
-            author = commit.author.name
-            author_stats[author]['commit_count'] += 1
-            
-            # Analyze commit
-            stats = self.analyze_commit(commit)
-            author_stats[author]['lines_added'] += stats['lines_added']
-            author_stats[author]['lines_deleted'] += stats['lines_deleted']
-            author_stats[author]['files_modified'] += stats['files_modified']
-            author_stats[author]['complexity_score'] += stats['complexity_score']
-            
-            # Analyze message quality
-            msg_quality = self.analyze_commit_message_quality(commit.message)
-            author_stats[author]['message_qualities'].append(msg_quality)
-            
-            # Aggregate LLM analysis results
-            llm_data = stats.get('llm_analysis', {})
-            author_stats[author]['llm_logical_impacts'].append(llm_data.get('logical_impact', 0.0))
-            author_stats[author]['llm_meaningful_scores'].append(llm_data.get('meaningful_score', 0.0))
-            author_stats[author]['llm_comment_ratios'].append(llm_data.get('comment_ratio', 0.0))
-            author_stats[author]['llm_print_ratios'].append(llm_data.get('print_debug_ratio', 0.0))
-            author_stats[author]['llm_message_matches'].append(llm_data.get('commit_message_match', 0.5))
-            
-            # Collect mismatch warnings
-            if llm_data.get('mismatch_warning'):
-                author_stats[author]['mismatch_warnings'].append({
-                    'commit': commit.hexsha[:7],
-                    'message': commit.message.split('\n')[0][:50],
-                    'warning': llm_data.get('mismatch_warning')
-                })
-        
-        # Calculate derived metrics for each author
+        if np is not None and (_compiled_kernels is None or len(author_stats) >= _JIT_MIN_AUTHORS):
+            # Array scoring needs every author's totals up front
+            results = {author: totals.to_dict() for author, totals in author_stats.items()}
+            self._score_authors(list(results.values()))
+            for stats in results.values():
+                stats['work_style'] = self.get_work_style(stats)
+            return results
+        
+        # Derive each author's metrics, scores and work style in one pass
+        score_author = self._score_author_compiled if _compiled_kernels is not None else self._score_author
         results = {}
-        for author, stats in author_stats.items():
-            # Calculate average message quality
-            if stats['message_qualities']:
-                stats['avg_message_quality'] = sum(stats['message_qualities']) / len(stats['message_qualities'])
-            else:
-                stats['avg_message_quality'] = 0.5
-            
-            # Calculate LLM-based metrics
-            if stats['llm_logical_impacts']:
-                stats['avg_logical_impact'] = sum(stats['llm_logical_impacts']) / len(stats['llm_logical_impacts'])
-            else:
-                stats['avg_logical_impact'] = 0.0
-            
-            if stats['llm_meaningful_scores']:
-                stats['avg_meaningful_score'] = sum(stats['llm_meaningful_scores']) / len(stats['llm_meaningful_scores'])
-            else:
-                stats['avg_meaningful_score'] = 0.0
-            
-            if stats['llm_comment_ratios']:
-                stats['avg_comment_ratio'] = sum(stats['llm_comment_ratios']) / len(stats['llm_comment_ratios'])
-            else:
-                stats['avg_comment_ratio'] = 0.0
-            
-            if stats['llm_print_ratios']:
-                stats['avg_print_ratio'] = sum(stats['llm_print_ratios']) / len(stats['llm_print_ratios'])
-            else:
-                stats['avg_print_ratio'] = 0.0
-            
-            if stats['llm_message_matches']:
-                stats['avg_message_match'] = sum(stats['llm_message_matches']) / len(stats['llm_message_matches'])
-            else:
-                stats['avg_message_match'] = 0.5
-            
-            # Calculate scores
-            stats['quality_score'] = self.calculate_quality_score(stats)
-            stats['difficulty_score'] = self.calculate_difficulty_score(stats)
-            stats['value_score'] = self.calculate_value_score(stats)
+        for author, totals in author_stats.items():
+            stats = results[author] = totals.to_dict()
+            score_author(stats)
             stats['work_style'] = self.get_work_style(stats)
-            
-            # Remove temporary data
-            del stats['message_qualities']
-            del stats['llm_logical_impacts']
-            del stats['llm_meaningful_scores']
-            del stats['llm_comment_ratios']
-            del stats['llm_print_ratios']
-            del stats['llm_message_matches']
-            
-            results[author] = stats
         
         return results
@@ -6,9 +6,12 @@ Command-line interface for analyzing git repository commits and contributor valu
 """
 
 import click
+import heapq
 import os
-from tabulate import tabulate
-from commit_analyzer import CommitAnalyzer
+
+
+# Contributors shown in table format unless --top is given
+DEFAULT_TABLE_TOP = 50
 
 
 @click.command()
@@ -19,7 +22,16 @@ from commit_analyzer import CommitAnalyzer
               default='value', help='Sort results by metric')
 @click.option('--months', '-m', type=int, default=1,
               help='Number of months to analyze (default: 1, use 0 for all commits)')
-def analyze(repo_path, format, sort_by, months):
+@click.option('--num-workers', '-j', type=click.IntRange(min=1), default=os.cpu_count() or 1,
+              help='Number of worker processes for commit analysis (default: number of CPUs, 1 disables)')
+@click.option('--build-commit-graph', is_flag=True, default=False,
+              help='Write a commit-graph file if the repository has none. '
+                   'Makes commit enumeration up to ~10x faster on large histories')
+@click.option('--top', '-t', type=click.IntRange(min=1), default=None,
+              help='Number of top contributors to show (default: 50 for table, all for detailed)')
+@click.option('--no-cache', is_flag=True, default=False,
+              help='Analyze every commit again instead of reusing results cached by earlier runs')
+def analyze(repo_path, format, sort_by, months, num_workers, build_commit_graph, top, no_cache):
     """
     Analyze git repository commits and show contributor metrics.
     
@@ -30,7 +42,12 @@ def analyze(repo_path, format, sort_by, months):
         git-tracker . --format detailed --sort-by quality
         git-tracker /path/to/repo --months 3
         git-tracker /path/to/repo --months 0  # Analyze all commits
+        git-tracker /path/to/repo --num-workers 1  # Analyze sequentially
+        git-tracker /path/to/repo --top 10  # Show the top 10 contributors
     """
+    # Imported here so --help does not load GitPython and the analysis modules
+    from commit_analyzer import CommitAnalyzer
+    
     if months == 0:
         time_period_text = "(All Commits)"
         click.echo(f"\n🔍 Analyzing repository (all commits): {os.path.abspath(repo_path)}\n")
@@ -39,8 +56,10 @@ def analyze(repo_path, format, sort_by, months):
         click.echo(f"\n🔍 Analyzing repository (last {months} month{'s' if months > 1 else ''}): {os.path.abspath(repo_path)}\n")
     
     try:
-        analyzer = CommitAnalyzer(repo_path)
-        results = analyzer.analyze_repository(months=months)
+        analyzer = CommitAnalyzer(
+            repo_path, build_commit_graph=build_commit_graph, use_cache=not no_cache
+        )
+        results = analyzer.analyze_repository(months=months, num_workers=num_workers)
         
         if not results:
             if months == 0:
@@ -56,17 +75,23 @@ def analyze(repo_path, format, sort_by, months):
             'difficulty': 'difficulty_score',
             'commits': 'commit_count'
         }
-        sorted_results = sorted(
-            results.items(), 
-            key=lambda x: x[1][sort_keys[sort_by]], 
-            reverse=True
-        )
+        if top is None:
+            top = DEFAULT_TABLE_TOP if format == 'table' else len(results)
+        sort_key = lambda x: x[1][sort_keys[sort_by]]
+        if top < len(results):
+            # Only the top contributors are shown: select them in O(N log K)
+            sorted_results = heapq.nlargest(top, results.items(), key=sort_key)
+        else:
+            sorted_results = sorted(results.items(), key=sort_key, reverse=True)
         
         if format == 'table':
             display_table(sorted_results, time_period_text)
         else:
             display_detailed(sorted_results, time_period_text)
         
+        if len(sorted_results) < len(results):
+            click.echo(f"\nShowing top {len(sorted_results)} of {len(results)} contributors (use --top to change)")
+        
         # Display summary
         display_summary(results, time_period_text)
         
@@ -83,6 +108,8 @@ def analyze(repo_path, format, sort_by, months):
 
 def display_table(results, time_period_text):
     """Display results in a compact table format."""
+    from tabulate import tabulate
+    
     headers = [
         'Author', 
         'Commits', 
@@ -0,0 +1,63 @@
+# cython: language_level=3, boundscheck=False, wraparound=False, cdivision=True
+# distutils: extra_compile_args = -ffp-contract=off
+"""
+Compiled per-author score kernels
+
+Native versions of CommitAnalyzer.calculate_quality_score,
+calculate_difficulty_score and calculate_value_score, used by
+commit_analyzer when this module has been built (see setup.sh). Floating
+point contraction is disabled so results match the Python reference
+exactly.
+"""
+
+
+cpdef double quality_score(long long commit_count, long long lines_added, long long lines_deleted,
+                           double avg_message_quality):
+    """Quality score of an author (see CommitAnalyzer.calculate_quality_score)."""
+    cdef long long total_changes
+    cdef double churn_ratio
+
+    if commit_count == 0:
+        return 0.0
+
+    total_changes = lines_added + lines_deleted
+    if total_changes == 0:
+        churn_ratio = 1.0
+    else:
+        churn_ratio = 1 - (<double>abs(lines_added - lines_deleted) / <double>total_changes)
+
+    return round(churn_ratio * 40 + avg_message_quality * 60, 2)
+
+
+cpdef double difficulty_score(long long commit_count, long long lines_added, long long lines_deleted,
+                              long long files_modified, long long complexity_score):
+    """Difficulty score of an author (see CommitAnalyzer.calculate_difficulty_score)."""
+    cdef double files_score, complexity, lines_score
+
+    if commit_count == 0:
+        return 0.0
+
+    files_score = min(<double>files_modified / commit_count * 10, 40)
+    complexity = min(<double>complexity_score / commit_count * 10, 40)
+    lines_score = min(<double>(lines_added + lines_deleted) / commit_count / 10, 20)
+
+    return round(files_score + complexity + lines_score, 2)
+
+
+cpdef double value_score(long long commit_count, long long lines_added, long long lines_deleted,
+                         double quality, double difficulty):
+    """Value score of an author (see CommitAnalyzer.calculate_value_score)."""
+    cdef double contribution_score, frequency_score, quality_factor, value
+
+    if commit_count == 0:
+        return 0.0
+
+    contribution_score = min(max(<double>(lines_added - lines_deleted) / 100, 0), 30)
+    frequency_score = min(commit_count * 2, 30)
+    quality_factor = quality / 100 if quality > 0 else 0.5
+
+    value = (contribution_score + frequency_score) * (0.5 + quality_factor * 0.5)
+    if difficulty > 50:
+        value *= 1.2
+
+    return round(min(value, 100), 2)
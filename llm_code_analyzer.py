@@ -10,8 +10,365 @@ it uses heuristic analysis by default to avoid heavy model loading.
 Full LLM analysis can be enabled by setting use_llm=True in initialization.
 """
 
+import hashlib
+import importlib.util
 import re
-from typing import Dict, List, Tuple, Optional, Any
+from bisect import bisect_right
+from functools import lru_cache
+from itertools import accumulate
+from typing import Dict, List, NamedTuple, Set, Tuple, Optional, Any
+
+try:
+    # Optional: Hyperscan finds log statements in a whole diff in one pass
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+try:
+    # Optional: impact ratios of many diffs are computed as array operations
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    # Optional: compiled line classifier (built from classifier.pyx by setup.sh)
+    import classifier as _compiled_classifier
+except ImportError:
+    _compiled_classifier = None
+
+
+# Comment styles, matched as prefixes of a line
+_COMMENT_PREFIXES = (
+    '#',            # Python, Ruby, Shell
+    '//',           # JavaScript, Java, C++, C#
+    '/*',           # Block comment start
+    '*',            # Block comment continuation and end
+    '<!--',         # HTML, XML
+    '"""',          # Python docstring
+    "'''",          # Python docstring
+)
+
+# Print and logging statements, matched anywhere in a line (case-insensitive)
+_LOG_PATTERNS = (
+    r'\bprint\s*\(',
+    r'\bconsole\.log\s*\(',
+    r'\bconsole\.(debug|info|warn|error)\s*\(',
+    r'\blogger\.',
+    r'\blogging\.',
+    r'\bLog\.',
+    r'\bSystem\.out\.print',
+    r'\bSystem\.err\.print',
+    r'\bfprintf\s*\(',
+    r'\bprintf\s*\(',
+    r'\bcout\s*<<',
+    r'\bcerr\s*<<',
+)
+
+# Indicators of logical code, matched anywhere in a line
+_LOGICAL_PATTERNS = (
+    r'\bdef\s+\w+',          # Function definition (Python)
+    r'\bfunction\s+\w+',     # Function definition (JavaScript)
+    r'\bclass\s+\w+',        # Class definition
+    r'\bif\s+',              # Conditional
+    r'\belse\s*:',           # Conditional
+    r'\bfor\s+',             # Loop
+    r'\bwhile\s+',           # Loop
+    r'\breturn\s+',          # Return statement
+    r'\bimport\s+',          # Import
+    r'\bfrom\s+\w+\s+import', # Import
+    r'\w+\s*=\s*',           # Assignment
+    r'\w+\s*\(',             # Function call
+    r'\.\w+\(',              # Method call
+    r'\bawait\s+',           # Async operation
+    r'\basync\s+',           # Async definition
+    r'\btry\s*:',            # Exception handling
+    r'\bexcept\s+',          # Exception handling
+    r'\bcatch\s*\(',         # Exception handling
+    r'\bthrow\s+',           # Exception throwing
+    r'\braise\s+',           # Exception raising
+    r'[a-zA-Z_]\w*',         # Any other identifier-like content
+)
+
+# Each group of patterns is compiled once into a single alternation, so a
+# line is classified with one regex scan per category
+_LOG_RE = re.compile('|'.join(_LOG_PATTERNS), re.IGNORECASE)
+_LOGICAL_RE = re.compile('|'.join(_LOGICAL_PATTERNS))
+
+# Common commit message keywords: category -> word forms that indicate it
+_KEYWORD_VARIANTS = {
+    'fix': ['fix', 'fixed', 'fixes', 'fixing', 'bugfix', 'bugfixes', 'hotfix', 'hotfixes'],
+    'feature': ['feature', 'features', 'add', 'added', 'adds', 'adding',
+                'implement', 'implements', 'implemented', 'implementing', 'implementation'],
+    'refactor': ['refactor', 'refactored', 'refactoring', 'refactors',
+                 'restructure', 'restructured', 'restructuring'],
+    'update': ['update', 'updated', 'updates', 'updating', 'upgrade', 'upgraded', 'upgrades', 'upgrading'],
+    'remove': ['remove', 'removed', 'removes', 'removing', 'delete', 'deleted', 'deletes', 'deleting'],
+    'test': ['test', 'testing', 'tests', 'tested'],
+    'docs': ['doc', 'docs', 'documentation', 'document', 'documented',
+             'comment', 'comments', 'commented'],
+    'style': ['style', 'styling', 'format', 'formatted', 'formatting'],
+    'optimize': ['optimize', 'optimized', 'optimizes', 'optimizing', 'optimization', 'performance',
+                 'improve', 'improved', 'improves', 'improving', 'improvement'],
+}
+
+# Flat word form -> category lookup for the words of a message
+_VARIANT_TO_CATEGORY = {
+    variant: category for category, variants in _KEYWORD_VARIANTS.items() for variant in variants
+}
+
+_WORD_RE = re.compile(r'\w+')
+
+# Message keyword -> change types that are a close enough match for it
+_SEMANTIC_MATCHES = {
+    'fix': frozenset({'update', 'refactor'}),
+    'feature': frozenset({'update', 'refactor'}),
+    'update': frozenset({'fix', 'feature', 'optimize'}),
+    'refactor': frozenset({'update', 'optimize'}),
+    'test': frozenset({'feature'}),
+    'docs': frozenset(),
+}
+
+# Line classes returned by LLMCodeAnalyzer._classify_line, as bits (a line
+# gets at most one: comments win over logging, logging over logical code)
+_LINE_COMMENT = 1
+_LINE_LOG = 2
+_LINE_LOGICAL = 4
+
+# What analyze_change_type looks for in the added lines, as bits combined
+# over all lines (see _line_contents)
+_LINE_DEF = 8
+_LINE_CLASS_DEF = 16
+_LINE_IMPORT = 32
+_LINE_TEST = 64
+# Once all bits are found the rest of a diff is not checked
+_LINE_CONTENTS_DONE = _LINE_DEF | _LINE_CLASS_DEF | _LINE_IMPORT | _LINE_TEST
+
+# Substrings setting each content bit, matched in a line without surrounding
+# whitespace (so e.g. a trailing 'def ' does not count); the test markers are
+# matched case-insensitively
+_CONTENT_MARKERS = (
+    (_LINE_DEF, ('def ', 'function ')),
+    (_LINE_CLASS_DEF, ('class ',)),
+    (_LINE_IMPORT, ('import ', 'from ')),
+)
+_TEST_MARKERS = ('test', 'assert')
+
+
+def _patterns_hash() -> str:
+    """
+    Hash of the pattern tables that classifier.pyx implements by hand,
+    which it records as PATTERNS_HASH.
+    """
+    tables = (_COMMENT_PREFIXES, _LOG_PATTERNS, _LOGICAL_PATTERNS, _CONTENT_MARKERS, _TEST_MARKERS)
+    return hashlib.sha256(repr(tables).encode('utf-8')).hexdigest()
+
+
+if (_compiled_classifier is not None
+        and getattr(_compiled_classifier, 'PATTERNS_HASH', None) != _patterns_hash()):
+    # Built for other patterns than these: classify lines with the regexes
+    _compiled_classifier = None
+
+# Hyperscan database of the log patterns, compiled on first use
+_log_database = None
+
+
+def _find_log_lines(lines: List[str]) -> Optional[Set[int]]:
+    """
+    Find the lines containing a print or logging statement with a single
+    Hyperscan pass over all of them.
+    
+    Returns:
+        Indices of the matching lines, or None when Hyperscan is not
+        installed or the text is not ASCII (Hyperscan does not reproduce
+        Python's Unicode case folding); check lines one by one then
+    """
+    global _log_database
+    if hyperscan is None:
+        return None
+    text = '\n'.join(lines)
+    if not text.isascii():
+        return None
+    
+    if _log_database is None:
+        # Lines are scanned as one buffer: \s must not match the newlines
+        # between them, but must match the separators Python's \s matches
+        whitespace = r'[\t\x0b\x0c\r\x1c-\x1f ]'
+        database = hyperscan.Database()
+        database.compile(
+            expressions=[pattern.replace(r'\s', whitespace).encode() for pattern in _LOG_PATTERNS],
+            ids=list(range(len(_LOG_PATTERNS))),
+            flags=[hyperscan.HS_FLAG_CASELESS] * len(_LOG_PATTERNS)
+        )
+        _log_database = database
+    
+    # accumulate() has no initial argument before Python 3.8
+    line_starts = [0] + list(accumulate(len(line) + 1 for line in lines[:-1]))
+    found = set()
+    
+    def on_match(pattern_id, start, end, flags, context):
+        found.add(bisect_right(line_starts, end - 1) - 1)
+    
+    _log_database.scan(text.encode('ascii'), match_event_handler=on_match)
+    return found
+
+
+def _is_log_statement(line: str) -> bool:
+    """Check if a line is a print or logging statement."""
+    # Every log pattern contains one of these words, so most lines are
+    # ruled out without running the regex. Non-ASCII lines always go to
+    # the regex: its case-insensitive matching also folds characters such
+    # as 'ſ' and 'ı' that lower() leaves alone
+    if line.isascii():
+        line_lower = line.lower()
+        if ('print' not in line_lower and 'log' not in line_lower and 'console' not in line_lower
+                and 'cout' not in line_lower and 'cerr' not in line_lower):
+            return False
+    return _LOG_RE.search(line) is not None
+
+
+@lru_cache(maxsize=8192)
+def _classify_cached(line: str, is_log: Optional[bool] = None) -> int:
+    """
+    Classify a line without leading whitespace (see
+    LLMCodeAnalyzer._classify_line).
+    
+    Results are cached on the line content and shared by all analyzers:
+    braces, returns and common imports repeat across hunks and commits.
+    is_log only saves the log check; the result depends on the line alone.
+    """
+    if not line:
+        return 0
+    # Same checks as _is_comment and _is_logical_code, for a line without
+    # leading whitespace
+    if line.startswith(_COMMENT_PREFIXES):
+        return _LINE_COMMENT
+    if is_log if is_log is not None else _is_log_statement(line):
+        return _LINE_LOG
+    if _LOGICAL_RE.search(line):
+        return _LINE_LOGICAL
+    return 0
+
+
+def _classify_added_line(line: str, is_log: Optional[bool] = None) -> int:
+    """Classify a line (see LLMCodeAnalyzer._classify_line)."""
+    # Only leading whitespace needs removing: every pattern that could
+    # match trailing whitespace also contains an identifier the
+    # fallback pattern matches, so stripping the end changes nothing
+    return _classify_cached(line.lstrip(), is_log)
+
+
+def _line_contents(line: str, found: int = 0) -> int:
+    """
+    Add the content bits of a line (see _CONTENT_MARKERS) to those already
+    found; bits in found are not checked again.
+    """
+    line_stripped = line.strip()
+    for bit, markers in _CONTENT_MARKERS:
+        if not found & bit:
+            for marker in markers:
+                if marker in line_stripped:
+                    found |= bit
+                    break
+    if not found & _LINE_TEST:
+        line_lower = line_stripped.lower()
+        for marker in _TEST_MARKERS:
+            if marker in line_lower:
+                found |= _LINE_TEST
+                break
+    return found
+
+
+def _split_added_lines(diff_text: str) -> List[str]:
+    """Extract lines that were added (start with +) from diff."""
+    # Split on '\n' only: splitlines() would also break lines at form
+    # feeds and other separators that can appear inside a diff line
+    return [line[1:] for line in diff_text.split('\n')
+            if line.startswith('+') and not line.startswith('+++')]
+
+
+def _count_line_classes(added_lines: List[str]) -> Tuple[int, int, int, int]:
+    """
+    Count the comment, print/logging and logical code lines among the
+    added lines of a diff, and combine their contents in the same pass.
+    
+    Returns:
+        Tuple of (comment_count, print_debug_count, logical_code_count,
+        contents), contents holding the _line_contents bits of the lines
+        (checked until all are found)
+    """
+    if _compiled_classifier is not None:
+        return _compiled_classifier.count_line_classes(
+            added_lines, _classify_added_line, _line_contents
+        )
+    
+    comment_count = 0
+    print_debug_count = 0
+    logical_code_count = 0
+    contents = 0
+    log_lines = _find_log_lines(added_lines)
+    
+    for index, line in enumerate(added_lines):
+        if not line:
+            continue
+        if contents != _LINE_CONTENTS_DONE:
+            contents = _line_contents(line, contents)
+        line_class = _classify_added_line(
+            line, index in log_lines if log_lines is not None else None
+        )
+        comment_count += line_class & _LINE_COMMENT
+        print_debug_count += (line_class & _LINE_LOG) >> 1
+        logical_code_count += (line_class & _LINE_LOGICAL) >> 2
+    
+    return comment_count, print_debug_count, logical_code_count, contents
+
+
+def _classify_lines(lines: List[str]) -> 'np.ndarray':
+    """Classify many lines into a uint8 array of line classes (needs NumPy)."""
+    line_classes = np.zeros(len(lines), dtype=np.uint8)
+    if _compiled_classifier is not None:
+        _compiled_classifier.classify_lines(lines, _classify_added_line, line_classes)
+        return line_classes
+    
+    log_lines = _find_log_lines(lines)
+    line_classes[:] = [
+        _classify_added_line(line, index in log_lines if log_lines is not None else None)
+        for index, line in enumerate(lines)
+    ]
+    return line_classes
+
+
+class DiffFacts(NamedTuple):
+    """What the added lines of a diff contain, as used by the analyses."""
+    
+    # Lines of each class (see LLMCodeAnalyzer._classify_line)
+    comment_count: int
+    print_debug_count: int
+    logical_code_count: int
+    # Definitions, imports and tests, found by substring (see
+    # _line_contents)
+    has_function_def: bool
+    has_class_def: bool
+    has_import: bool
+    has_tests: bool
+
+
+@lru_cache(maxsize=32)
+def _parse_diff_cached(diff_text: str) -> DiffFacts:
+    """
+    Parse a diff once for analyze_code_impact and analyze_change_type.
+    
+    Cached on the diff text: verify_commit_message runs on the same diff
+    right after analyze_code_impact, so each diff is scanned only once.
+    """
+    comment_count, print_debug_count, logical_code_count, contents = \
+        _count_line_classes(_split_added_lines(diff_text))
+    return DiffFacts(
+        comment_count, print_debug_count, logical_code_count,
+        has_function_def=bool(contents & _LINE_DEF),
+        has_class_def=bool(contents & _LINE_CLASS_DEF),
+        has_import=bool(contents & _LINE_IMPORT),
+        has_tests=bool(contents & _LINE_TEST)
+    )
 
 
 class LLMCodeAnalyzer:
@@ -20,7 +377,8 @@ class LLMCodeAnalyzer:
     commit message accuracy.
     """
     
-    def __init__(self, use_llm: bool = False, model_name: str = "mistralai/Mistral-7B-Instruct-v0.2"):
+    def __init__(self, use_llm: bool = False, model_name: str = "mistralai/Mistral-7B-Instruct-v0.2",
+                 quiet: bool = False):
         """
         Initialize the code analyzer.
         
@@ -29,12 +387,16 @@ class LLMCodeAnalyzer:
                     Default False uses heuristic-based analysis (faster, lighter)
             model_name: HuggingFace model identifier for code analysis
                        Default: mistralai/Mistral-7B-Instruct-v0.2 (open-source, no API key needed)
+            quiet: Fall back to the heuristics without printing a warning
+                   when the model cannot be initialized
         """
         self.use_llm = use_llm
         self.model_name = model_name
+        self.quiet = quiet
         self.tokenizer = None
         self.model = None
         self._initialized = False
+        self._init_attempted = False
         
     def _lazy_init(self):
         """
@@ -43,18 +405,38 @@ class LLMCodeAnalyzer:
         Note: This method is reserved for future use when full LLM model support
         is enabled via use_llm=True. Currently, the tool uses heuristic-based
         analysis by default for speed and simplicity.
+        
+        Initialization is attempted once per analyzer; after a failure the
+        heuristics are used without retrying on every call.
         """
-        if self.use_llm and not self._initialized:
+        if self.use_llm and not self._init_attempted:
+            self._init_attempted = True
+            if importlib.util.find_spec('transformers') is None:
+                self._report_fallback("transformers is not installed")
+                return
             try:
                 from transformers import AutoTokenizer
                 # Use a lightweight model for code understanding
                 self.tokenizer = AutoTokenizer.from_pretrained(self.model_name)
                 self._initialized = True
             except Exception as e:
-                print(f"Warning: Could not initialize LLM model: {e}")
-                print("Falling back to heuristic-based analysis")
+                self._report_fallback(e)
                 self._initialized = False
     
+    def _report_fallback(self, reason):
+        """Warn that the heuristics are used because the model failed to load."""
+        if not self.quiet:
+            print(f"Warning: Could not initialize LLM model: {reason}")
+            print("Falling back to heuristic-based analysis")
+    
+    def model_available(self) -> bool:
+        """
+        Check whether the LLM model is loaded, initializing it first if that
+        has not been attempted yet (and warning if it fails).
+        """
+        self._lazy_init()
+        return self._initialized
+    
     def analyze_code_impact(self, diff_text: str) -> Dict[str, float]:
         """
         Analyze the semantic impact of code changes.
@@ -69,6 +451,16 @@ class LLMCodeAnalyzer:
             - print_debug_ratio: Ratio of print/logging statements
             - meaningful_score: Overall meaningful code score
         """
+        # Scores are computed at full precision and rounded only here
+        return {
+            key: round(value, 3) for key, value in self._analyze_code_impact_raw(diff_text).items()
+        }
+    
+    def _analyze_code_impact_raw(self, diff_text: str) -> Dict[str, float]:
+        """
+        Analyze the semantic impact of code changes without rounding the
+        scores (see analyze_code_impact).
+        """
         # Initialize LLM model if needed
         self._lazy_init()
         
@@ -80,37 +472,11 @@ class LLMCodeAnalyzer:
                 'meaningful_score': 0.0
             }
         
-        # Parse the diff to extract added lines
-        added_lines = self._extract_added_lines(diff_text)
-        
-        if not added_lines:
-            return {
-                'logical_impact': 0.0,
-                'comment_ratio': 0.0,
-                'print_debug_ratio': 0.0,
-                'meaningful_score': 0.0
-            }
-        
-        # Analyze the semantic content
-        comment_count = 0
-        print_debug_count = 0
-        logical_code_count = 0
-        
-        for line in added_lines:
-            line_stripped = line.strip()
-            
-            if not line_stripped:
-                continue
-                
-            # Detect comments
-            if self._is_comment(line_stripped):
-                comment_count += 1
-            # Detect print/logging statements
-            elif self._is_print_or_log(line_stripped):
-                print_debug_count += 1
-            # Detect logical/functional code
-            elif self._is_logical_code(line_stripped):
-                logical_code_count += 1
+        # Analyze the semantic content of the added lines
+        facts = _parse_diff_cached(diff_text)
+        comment_count = facts.comment_count
+        print_debug_count = facts.print_debug_count
+        logical_code_count = facts.logical_code_count
         
         total_meaningful_lines = comment_count + print_debug_count + logical_code_count
         
@@ -135,10 +501,71 @@ class LLMCodeAnalyzer:
         )
         
         return {
-            'logical_impact': round(logical_ratio, 3),
-            'comment_ratio': round(comment_ratio, 3),
-            'print_debug_ratio': round(print_debug_ratio, 3),
-            'meaningful_score': round(meaningful_score, 3)
+            'logical_impact': logical_ratio,
+            'comment_ratio': comment_ratio,
+            'print_debug_ratio': print_debug_ratio,
+            'meaningful_score': meaningful_score
+        }
+    
+    def analyze_batch(self, diffs: List[str]) -> Dict[str, Any]:
+        """
+        Analyze the semantic impact of many diffs at once.
+        
+        Args:
+            diffs: The git diff texts to analyze
+            
+        Returns:
+            Dictionary with the analyze_code_impact scores, each an array
+            holding one value per diff (a list when NumPy is not installed)
+        """
+        if np is None:
+            results = [self.analyze_code_impact(diff_text) for diff_text in diffs]
+            return {
+                key: [result[key] for result in results]
+                for key in ('logical_impact', 'comment_ratio', 'print_debug_ratio', 'meaningful_score')
+            }
+        
+        self._lazy_init()
+        
+        # The added lines of all diffs are classified in one pass, then each
+        # line class is summed per diff from its own array
+        lines = []
+        starts = []
+        for diff_text in diffs:
+            starts.append(len(lines))
+            lines.extend(_split_added_lines(diff_text))
+        line_classes = _classify_lines(lines)
+        is_comment = line_classes & _LINE_COMMENT
+        is_log = (line_classes & _LINE_LOG) >> 1
+        is_logical = (line_classes & _LINE_LOGICAL) >> 2
+        
+        counts = np.zeros((len(diffs), 3), dtype=np.int64)
+        if lines:
+            # reduceat sums from each start to the next, so diffs without
+            # added lines are left out and keep zero counts
+            starts = np.array(starts, dtype=np.intp)
+            has_lines = np.diff(starts, append=len(lines)) > 0
+            for column, flags in enumerate((is_comment, is_log, is_logical)):
+                counts[has_lines, column] = np.add.reduceat(flags, starts[has_lines], dtype=np.int64)
+        
+        # Diffs without meaningful lines keep all-zero ratios
+        totals = counts.sum(axis=1)
+        comment_ratio, print_debug_ratio, logical_ratio = (
+            counts / np.where(totals > 0, totals, 1)[:, np.newaxis]
+        ).T
+        # Same weights and summation order as analyze_code_impact
+        meaningful_score = logical_ratio * 0.8 + comment_ratio * 0.15 + print_debug_ratio * 0.05
+        
+        # Round like the builtin round() does (np.round can differ in the
+        # last digit)
+        return {
+            key: np.array([round(value, 3) for value in values.tolist()], dtype=np.float64)
+            for key, values in (
+                ('logical_impact', logical_ratio),
+                ('comment_ratio', comment_ratio),
+                ('print_debug_ratio', print_debug_ratio),
+                ('meaningful_score', meaningful_score),
+            )
         }
     
     def verify_commit_message(self, commit_message: str, diff_text: str) -> Dict[str, Any]:
@@ -157,6 +584,19 @@ class LLMCodeAnalyzer:
             - mismatch_warning: Warning message if mismatch detected
         """
         if not commit_message or not diff_text:
+            return self.verify_commit_message_against(commit_message, None)
+        
+        # Analyze actual changes
+        return self.verify_commit_message_against(commit_message, self.analyze_change_type(diff_text))
+    
+    def verify_commit_message_against(self, commit_message: str,
+                                      change_analysis: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Verify a commit message against the analyze_change_type result of
+        its diff (None for an empty diff), e.g. one kept from an earlier
+        analysis of the same diff. Same result as verify_commit_message.
+        """
+        if not commit_message or change_analysis is None:
             return {
                 'match_score': 0.5,
                 'detected_keywords': [],
@@ -167,9 +607,6 @@ class LLMCodeAnalyzer:
         # Extract keywords from commit message
         message_keywords = self._extract_keywords(commit_message)
         
-        # Analyze actual changes
-        change_analysis = self._analyze_change_type(diff_text)
-        
         # Calculate match score
         match_score = self._calculate_match_score(message_keywords, change_analysis)
         
@@ -179,7 +616,8 @@ class LLMCodeAnalyzer:
             mismatch_warning = f"Commit message suggests '{', '.join(message_keywords)}' but changes appear to be {change_analysis['primary_type']}"
         
         return {
-            'match_score': round(match_score, 3),
+            # One of the fixed scores of _calculate_match_score, so not rounded
+            'match_score': match_score,
             'detected_keywords': message_keywords,
             'actual_changes': change_analysis['primary_type'],
             'mismatch_warning': mismatch_warning
@@ -187,158 +625,61 @@ class LLMCodeAnalyzer:
     
     def _extract_added_lines(self, diff_text: str) -> List[str]:
         """Extract lines that were added (start with +) from diff."""
-        lines = diff_text.split('\n')
-        added = []
-        for line in lines:
-            if line.startswith('+') and not line.startswith('+++'):
-                # Remove the '+' prefix
-                added.append(line[1:])
-        return added
+        return _split_added_lines(diff_text)
     
     def _is_comment(self, line: str) -> bool:
         """Check if a line is a comment."""
-        # Support multiple comment styles
-        comment_patterns = [
-            r'^\s*#',           # Python, Ruby, Shell
-            r'^\s*//',          # JavaScript, Java, C++, C#
-            r'^\s*/\*',         # Block comment start
-            r'^\s*\*',          # Block comment continuation
-            r'^\s*\*/',         # Block comment end
-            r'^\s*<!--',        # HTML, XML
-            r'^\s*"""',         # Python docstring
-            r"^\s*'''",         # Python docstring
-        ]
-        
-        for pattern in comment_patterns:
-            if re.match(pattern, line):
-                return True
-        return False
+        return line.lstrip().startswith(_COMMENT_PREFIXES)
     
     def _is_print_or_log(self, line: str) -> bool:
         """Check if a line is a print or logging statement."""
-        log_patterns = [
-            r'\bprint\s*\(',
-            r'\bconsole\.log\s*\(',
-            r'\bconsole\.(debug|info|warn|error)\s*\(',
-            r'\blogger\.',
-            r'\blogging\.',
-            r'\bLog\.',
-            r'\bSystem\.out\.print',
-            r'\bSystem\.err\.print',
-            r'\bfprintf\s*\(',
-            r'\bprintf\s*\(',
-            r'\bcout\s*<<',
-            r'\bcerr\s*<<',
-        ]
-        
-        for pattern in log_patterns:
-            if re.search(pattern, line, re.IGNORECASE):
-                return True
-        return False
+        return _is_log_statement(line)
     
     def _is_logical_code(self, line: str) -> bool:
         """
         Check if a line contains logical/functional code.
         This includes variable declarations, function calls, control flow, etc.
+        
+        Comments and logging are not excluded here; _classify_line checks
+        for them first.
         """
-        # Skip empty lines and pure whitespace
-        if not line.strip():
-            return False
+        # Code constructs, or any other alphanumeric content
+        return _LOGICAL_RE.search(line) is not None
+    
+    def _classify_line(self, line: str, is_log: Optional[bool] = None) -> int:
+        """
+        Classify a line in one pass.
         
-        # Skip if it's a comment or logging
-        if self._is_comment(line) or self._is_print_or_log(line):
-            return False
+        Args:
+            line: The line (surrounding whitespace does not change the class)
+            is_log: Whether the line is a print/logging statement, when
+                    already known from _find_log_lines
         
-        # Indicators of logical code
-        logical_patterns = [
-            r'\bdef\s+\w+',          # Function definition (Python)
-            r'\bfunction\s+\w+',     # Function definition (JavaScript)
-            r'\bclass\s+\w+',        # Class definition
-            r'\bif\s+',              # Conditional
-            r'\belse\s*:',           # Conditional
-            r'\bfor\s+',             # Loop
-            r'\bwhile\s+',           # Loop
-            r'\breturn\s+',          # Return statement
-            r'\bimport\s+',          # Import
-            r'\bfrom\s+\w+\s+import', # Import
-            r'\w+\s*=\s*',           # Assignment
-            r'\w+\s*\(',             # Function call
-            r'\.\w+\(',              # Method call
-            r'\bawait\s+',           # Async operation
-            r'\basync\s+',           # Async definition
-            r'\btry\s*:',            # Exception handling
-            r'\bexcept\s+',          # Exception handling
-            r'\bcatch\s*\(',         # Exception handling
-            r'\bthrow\s+',           # Exception throwing
-            r'\braise\s+',           # Exception raising
-        ]
-        
-        for pattern in logical_patterns:
-            if re.search(pattern, line):
-                return True
-        
-        # If it has alphanumeric content and isn't a comment/log, likely logical code
-        if re.search(r'[a-zA-Z_]\w*', line):
-            return True
-        
-        return False
+        Returns:
+            _LINE_COMMENT, _LINE_LOG, _LINE_LOGICAL, or 0 for empty and
+            other lines
+        """
+        return _classify_added_line(line, is_log)
     
     def _extract_keywords(self, commit_message: str) -> List[str]:
         """Extract meaningful keywords from commit message."""
-        # Common commit message keywords
-        keywords_map = {
-            'fix': ['fix', 'fixed', 'fixes', 'bugfix', 'hotfix'],
-            'feature': ['feature', 'add', 'added', 'implement', 'implements', 'implemented'],
-            'refactor': ['refactor', 'refactored', 'refactoring', 'restructure'],
-            'update': ['update', 'updated', 'upgrade', 'upgraded'],
-            'remove': ['remove', 'removed', 'delete', 'deleted'],
-            'test': ['test', 'testing', 'tests'],
-            'docs': ['doc', 'docs', 'documentation', 'comment', 'comments'],
-            'style': ['style', 'format', 'formatting'],
-            'optimize': ['optimize', 'optimized', 'performance', 'improve', 'improved'],
-        }
-        
-        message_lower = commit_message.lower()
-        found_keywords = []
-        
-        for category, variants in keywords_map.items():
-            for variant in variants:
-                if variant in message_lower:
-                    if category not in found_keywords:
-                        found_keywords.append(category)
-                    break
+        # Whole words only, so e.g. 'fixture' or 'address' match nothing
+        found = {_VARIANT_TO_CATEGORY.get(word) for word in _WORD_RE.findall(commit_message.lower())}
+        found_keywords = [category for category in _KEYWORD_VARIANTS if category in found]
         
         return found_keywords if found_keywords else ['unknown']
     
-    def _analyze_change_type(self, diff_text: str) -> Dict[str, Any]:
+    def analyze_change_type(self, diff_text: str) -> Dict[str, Any]:
         """
         Analyze what type of changes were actually made.
         """
-        added_lines = self._extract_added_lines(diff_text)
-        
-        # Categorize changes
-        has_function_def = False
-        has_class_def = False
-        has_import = False
-        has_logic = False
-        has_comments = False
-        has_tests = False
-        
-        for line in added_lines:
-            line_stripped = line.strip()
-            
-            if 'def ' in line_stripped or 'function ' in line_stripped:
-                has_function_def = True
-            if 'class ' in line_stripped:
-                has_class_def = True
-            if 'import ' in line_stripped or 'from ' in line_stripped:
-                has_import = True
-            if self._is_comment(line_stripped):
-                has_comments = True
-            if self._is_logical_code(line_stripped):
-                has_logic = True
-            if 'test' in line_stripped.lower() or 'assert' in line_stripped.lower():
-                has_tests = True
+        facts = _parse_diff_cached(diff_text)
+        has_function_def = facts.has_function_def
+        has_class_def = facts.has_class_def
+        has_import = facts.has_import
+        has_logic = facts.logical_code_count > 0
+        has_comments = facts.comment_count > 0
+        has_tests = facts.has_tests
         
         # Determine primary change type
         if has_class_def or has_function_def:
@@ -374,21 +715,10 @@ class LLMCodeAnalyzer:
         if primary_type in message_keywords:
             return 1.0
         
-        # Semantic matches
-        semantic_matches = {
-            'fix': ['update', 'refactor'],
-            'feature': ['update', 'refactor'],
-            'update': ['fix', 'feature', 'optimize'],
-            'refactor': ['update', 'optimize'],
-            'test': ['feature'],
-            'docs': [],
-        }
-        
         # Check for semantic matches
         for keyword in message_keywords:
-            if keyword in semantic_matches:
-                if primary_type in semantic_matches[keyword]:
-                    return 0.7
+            if primary_type in _SEMANTIC_MATCHES.get(keyword, ()):
+                return 0.7
         
         # Partial match
         if len(message_keywords) > 1:
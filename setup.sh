@@ -20,6 +20,23 @@ echo ""
 echo "📦 Installing dependencies..."
 python3 -m pip install -r requirements.txt
 
+# Optional: compile the score kernels and line classifier when Cython is available
+if python3 -c 'import Cython' &> /dev/null; then
+    echo ""
+    echo "⚙️  Compiling score kernels..."
+    if python3 -m Cython.Build.Cythonize -i -3 kernels.pyx > /dev/null; then
+        echo "✓ Score kernels compiled"
+    else
+        echo "⚠️  Could not compile score kernels, using the pure-Python scores"
+    fi
+    echo "⚙️  Compiling line classifier..."
+    if python3 -m Cython.Build.Cythonize -i -3 classifier.pyx > /dev/null; then
+        echo "✓ Line classifier compiled"
+    else
+        echo "⚠️  Could not compile line classifier, using the pure-Python classifier"
+    fi
+fi
+
 echo ""
 echo "✅ Setup complete!"
 echo ""
@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+"""
+Test script for Commit Analyzer
+
+This script builds a small throwaway git repository and checks the
+commit statistics collected by the analyzer.
+"""
+
+import os
+import subprocess
+import tempfile
+
+import commit_analyzer
+from commit_analyzer import CommitAnalyzer
+
+
+def _git(repo_path, *args):
+    """Run a git command inside the test repository."""
+    subprocess.run(
+        ['git', '-c', 'user.name=Alice', '-c', 'user.email=alice@example.com', *args],
+        cwd=repo_path, check=True, capture_output=True
+    )
+
+
+def _write(repo_path, name, content):
+    """Write a file inside the test repository."""
+    with open(os.path.join(repo_path, name), 'w') as f:
+        f.write(content)
+
+
+def _make_repo(repo_path):
+    """Create a repository with a few representative commits."""
+    _git(repo_path, 'init', '-q')
+    _write(repo_path, 'app.py', 'a = 1\nb = 2\nc = 3\n')
+    _write(repo_path, 'config.json', '{}\n')
+    _git(repo_path, 'add', '.')
+    _git(repo_path, 'commit', '-q', '-m', 'add initial application files')
+
+    _write(repo_path, 'app.py', 'a = 1\nb = 20\nc = 3\nd = 4\n')
+    _git(repo_path, 'mv', 'config.json', 'settings.json')
+    # Non-ASCII paths are C-quoted by git unless told otherwise
+    _write(repo_path, 'café.py', 'e = 5\n')
+    _git(repo_path, 'add', 'café.py')
+    _git(repo_path, 'commit', '-q', '-a', '-m', 'fix: update app values')
+
+    _git(repo_path, 'commit', '-q', '--allow-empty', '-m', 'empty commit')
+
+
+def test_numstat_matches_diff_counts():
+    """Test that batch numstat counts match per-commit diff counts."""
+    with tempfile.TemporaryDirectory() as repo_path:
+        _make_repo(repo_path)
+        # Changed lines that look like patch file headers
+        _write(repo_path, 'loop.c', 'int i;\n--i;\n')
+        _git(repo_path, 'add', 'loop.c')
+        _git(repo_path, 'commit', '-q', '-m', 'add loop')
+        _write(repo_path, 'loop.c', 'int i;\n++i;\n')
+        _git(repo_path, 'commit', '-q', '-a', '-m', 'fix: increment instead')
+        analyzer = CommitAnalyzer(repo_path)
+        commits = analyzer.get_commits_last_month(months=0)
+        numstat = analyzer._collect_numstat([commit.hexsha for commit in commits])
+
+        print("Test 1 - Numstat counts:")
+        assert len(numstat) == len(commits), "Should collect stats for every commit"
+
+        for commit in commits:
+            expected = analyzer.analyze_commit(commit)
+            actual = numstat[commit.hexsha]
+            print(f"  {commit.hexsha[:7]}: {actual}")
+            for key in ('lines_added', 'lines_deleted', 'files_modified', 'complexity_score'):
+                assert actual[key] == expected[key], f"{key} should match diff-based count"
+
+        root_commit = next(commit for commit in commits if not commit.parents)
+        root = numstat[root_commit.hexsha]
+        assert root['lines_added'] == 4, "Root commit should count all added lines"
+        assert root['files_modified'] == 2, "Root commit should count all files"
+        print("  ✓ Passed\n")
+
+
+def test_numstat_rename_path():
+    """Test resolution of renamed paths in numstat output."""
+    print("Test 2 - Renamed paths:")
+    assert CommitAnalyzer._numstat_path('app.py') == 'app.py'
+    assert CommitAnalyzer._numstat_path('old.py => new.py') == 'old.py'
+    assert CommitAnalyzer._numstat_path('src/{a.py => b.py}') == 'src/a.py'
+    assert CommitAnalyzer._numstat_path('src/{ => pkg}/a.py') == 'src/a.py'
+    assert CommitAnalyzer._numstat_path('"a\\tb.py"') == 'a\tb.py'
+    assert CommitAnalyzer._numstat_path('"q\\"a.py" => "q\\"b.py"') == 'q"a.py'
+    print("  ✓ Passed\n")
+
+
+def test_rename_counts_match_git():
+    """Test that diff counts of moved and rewritten files match git's rename detection."""
+    with tempfile.TemporaryDirectory() as repo_path:
+        _git(repo_path, 'init', '-q')
+        os.mkdir(os.path.join(repo_path, 'bin'))
+        _write(repo_path, 'bin/tool.py', ''.join(f'value_{i} = {i}\n' for i in range(20)))
+        _git(repo_path, 'add', '.')
+        _git(repo_path, 'commit', '-q', '-m', 'add tool')
+
+        # Move the tool and leave a symlink at its old path: git sees a
+        # modified bin/tool.py and an added libexec/tool.py (libgit2 instead
+        # splits the type change and pairs the old file with the new one)
+        os.mkdir(os.path.join(repo_path, 'libexec'))
+        _git(repo_path, 'mv', 'bin/tool.py', 'libexec/tool.py')
+        _write(repo_path, 'libexec/tool.py', ''.join(f'value_{i} = {i}\n' for i in range(2, 22)))
+        os.symlink('../libexec/tool.py', os.path.join(repo_path, 'bin/tool.py'))
+        _git(repo_path, 'add', '.')
+        _git(repo_path, 'commit', '-q', '-m', 'move tool to libexec')
+
+        analyzer = CommitAnalyzer(repo_path)
+        commit = analyzer.repo.head.commit
+        numstat = analyzer._collect_numstat([commit.hexsha])
+        stats = analyzer.analyze_commit(commit)
+
+        print("Test 3 - Rename detection:")
+        print(f"  {stats['lines_added']} added, {stats['lines_deleted']} deleted")
+        assert (stats['lines_added'], stats['lines_deleted'], stats['files_modified']) == (21, 20, 2)
+        for key in ('lines_added', 'lines_deleted', 'files_modified', 'complexity_score'):
+            assert stats[key] == numstat[commit.hexsha][key], f"{key} should match git numstat"
+        print("  ✓ Passed\n")
+
+
+def test_parallel_matches_sequential():
+    """Test that the worker pool produces the same results as a single process."""
+    with tempfile.TemporaryDirectory() as repo_path:
+        _make_repo(repo_path)
+        analyzer = CommitAnalyzer(repo_path)
+
+        print("Test 4 - Parallel analysis:")
+        sequential = analyzer.analyze_repository(months=0, num_workers=1)
+        parallel = analyzer.analyze_repository(months=0, num_workers=2)
+        print(f"  Authors: {list(parallel)}")
+        assert parallel == sequential, "Worker pool should not change results"
+        assert sequential['Alice']['commit_count'] == 3, "Should count every commit"
+
+        # A small first batch does not shrink the pool used by later batches
+        pool_sizes = []
+        start_worker_pool = analyzer._start_worker_pool
+        analyzer._start_worker_pool = lambda n: pool_sizes.append(n) or start_worker_pool(n)
+        analyzer._ANALYSIS_BATCH_SIZE = 2
+        assert analyzer.analyze_repository(months=0, num_workers=3) == sequential
+        assert pool_sizes == [3], "Pool should have the requested number of workers"
+        print("  ✓ Passed\n")
+
+
+def test_batched_analysis_matches():
+    """Test that analyzing history in small batches gives the same results."""
+    with tempfile.TemporaryDirectory() as repo_path:
+        _make_repo(repo_path)
+        analyzer = CommitAnalyzer(repo_path)
+
+        print("Test 5 - Batched analysis:")
+        commits = list(analyzer.iter_commits_in_window(months=0))
+        assert [c.hexsha for c in commits] == [c.hexsha for c in analyzer.get_commits_last_month(months=0)]
+        expected = analyzer.analyze_repository(months=0, num_workers=1)
+        analyzer._ANALYSIS_BATCH_SIZE = 1
+        assert analyzer.analyze_repository(months=0, num_workers=1) == expected, \
+            "Batch size should not change results"
+        print("  ✓ Passed\n")
+
+
+def test_vectorized_scores_match_scalar():
+    """Test that array-based scoring matches the per-author score functions."""
+    print("Test 6 - Vectorized scores:")
+    if commit_analyzer.np is None:
+        print("  NumPy not installed, skipping\n")
+        return
+
+    analyzer = CommitAnalyzer.__new__(CommitAnalyzer)
+    authors = [
+        {'commit_count': 1, 'lines_added': 0, 'lines_deleted': 0,
+         'files_modified': 0, 'complexity_score': 0, 'avg_message_quality': 0.5},
+        {'commit_count': 10, 'lines_added': 3190, 'lines_deleted': 0,
+         'files_modified': 21, 'complexity_score': 66, 'avg_message_quality': 0.4874465675244234},
+        {'commit_count': 27, 'lines_added': 2662, 'lines_deleted': 15350,
+         'files_modified': 9, 'complexity_score': 222, 'avg_message_quality': 0.9},
+        {'commit_count': 3, 'lines_added': 120, 'lines_deleted': 40,
+         'files_modified': 5, 'complexity_score': 9, 'avg_message_quality': 1.0},
+    ]
+    vectorized = [dict(stats) for stats in authors]
+    analyzer._score_authors(vectorized)
+
+    for stats, result in zip(authors, vectorized):
+        stats['quality_score'] = analyzer.calculate_quality_score(stats)
+        stats['difficulty_score'] = analyzer.calculate_difficulty_score(stats)
+        stats['value_score'] = analyzer.calculate_value_score(stats)
+        print(f"  {result['quality_score']}, {result['difficulty_score']}, {result['value_score']}")
+        for key in ('quality_score', 'difficulty_score', 'value_score'):
+            assert result[key] == stats[key], f"{key} should match scalar score"
+
+    # Kernels used for very large author counts (Numba-compiled if installed)
+    np = commit_analyzer.np
+    base_scores, _ = commit_analyzer._score_kernels(commit_analyzer._JIT_MIN_AUTHORS)
+    columns = [
+        np.array([s[key] for s in authors], dtype=np.int64)
+        for key in ('commit_count', 'lines_added', 'lines_deleted', 'files_modified', 'complexity_score')
+    ]
+    avg_message_quality = np.array([s['avg_message_quality'] for s in authors], dtype=np.float64)
+    expected = commit_analyzer._base_scores(*columns, avg_message_quality)
+    actual = base_scores(*columns, avg_message_quality)
+    assert all((e == a).all() for e, a in zip(expected, actual)), "Compiled kernels should match"
+    print("  ✓ Passed\n")
+
+
+def test_compiled_scores_match_scalar():
+    """Test that the compiled score kernels match the per-author score functions."""
+    print("Test 7 - Compiled scores:")
+    if commit_analyzer._compiled_kernels is None:
+        print("  Kernels not built, skipping\n")
+        return
+
+    analyzer = CommitAnalyzer.__new__(CommitAnalyzer)
+    for stats in (
+        {'commit_count': 0, 'lines_added': 0, 'lines_deleted': 0,
+         'files_modified': 0, 'complexity_score': 0, 'avg_message_quality': 0.5},
+        {'commit_count': 10, 'lines_added': 3190, 'lines_deleted': 0,
+         'files_modified': 21, 'complexity_score': 66, 'avg_message_quality': 0.4874465675244234},
+        {'commit_count': 27, 'lines_added': 2662, 'lines_deleted': 15350,
+         'files_modified': 9, 'complexity_score': 222, 'avg_message_quality': 0.9},
+    ):
+        compiled = dict(stats)
+        analyzer._score_author_compiled(compiled)
+        stats['quality_score'] = analyzer.calculate_quality_score(stats)
+        stats['difficulty_score'] = analyzer.calculate_difficulty_score(stats)
+        stats['value_score'] = analyzer.calculate_value_score(stats)
+        print(f"  {compiled['quality_score']}, {compiled['difficulty_score']}, {compiled['value_score']}")
+        assert compiled == stats, "Compiled kernels should match scalar scores"
+    print("  ✓ Passed\n")
+
+
+def test_cache_reuses_results():
+    """Test that cached commit results give the same analysis as a fresh run."""
+    with tempfile.TemporaryDirectory() as repo_path, tempfile.TemporaryDirectory() as cache_dir:
+        _make_repo(repo_path)
+
+        print("Test 8 - Commit cache:")
+        cached_analyzer = CommitAnalyzer(repo_path, use_cache=True, cache_dir=cache_dir)
+        first = cached_analyzer.analyze_repository(months=0, num_workers=1)
+        rows = cached_analyzer._cache.execute('SELECT COUNT(*) FROM commit_stats').fetchone()[0]
+        print(f"  Cached commits: {rows}")
+        assert rows == 3, "Should cache every analyzed commit"
+
+        # A new commit is analyzed, the others come from the cache
+        _write(repo_path, 'extra.py', 'def extra():\n    return 1\n')
+        _git(repo_path, 'add', 'extra.py')
+        _git(repo_path, 'commit', '-q', '-m', 'add extra helper')
+
+        cached_analyzer = CommitAnalyzer(repo_path, use_cache=True, cache_dir=cache_dir)
+        second = cached_analyzer.analyze_repository(months=0, num_workers=1)
+        fresh = CommitAnalyzer(repo_path).analyze_repository(months=0, num_workers=1)
+        assert first['Alice']['commit_count'] == 3
+        assert second == fresh, "Cached results should match a fresh analysis"
+        print("  ✓ Passed\n")
+
+
+def test_cache_skips_failed_analysis():
+    """Test that commits whose analysis failed are not cached."""
+    with tempfile.TemporaryDirectory() as repo_path, tempfile.TemporaryDirectory() as cache_dir:
+        _make_repo(repo_path)
+
+        def fail(diff_text):
+            raise RuntimeError('analysis failed')
+
+        print("Test 9 - Failed analysis:")
+        analyzer = CommitAnalyzer(repo_path, use_cache=True, cache_dir=cache_dir)
+        analyzer.llm_analyzer.analyze_code_impact = fail
+        analyzer.analyze_repository(months=0, num_workers=1)
+        rows = analyzer._cache.execute('SELECT COUNT(*) FROM commit_stats').fetchone()[0]
+        print(f"  Cached commits: {rows}")
+        assert rows == 1, "Only the empty commit should be cached"
+
+        # The next run analyzes the failed commits again
+        second = CommitAnalyzer(repo_path, use_cache=True, cache_dir=cache_dir)
+        assert second.analyze_repository(months=0, num_workers=1) == \
+            CommitAnalyzer(repo_path).analyze_repository(months=0, num_workers=1)
+        print("  ✓ Passed\n")
+
+
+def test_shallow_clone_boundary():
+    """Test that commits whose parents are cut off by a shallow clone count nothing."""
+    with tempfile.TemporaryDirectory() as repo_path, tempfile.TemporaryDirectory() as clone_dir:
+        _make_repo(repo_path)
+        clone_path = os.path.join(clone_dir, 'shallow')
+        subprocess.run(
+            ['git', 'clone', '-q', '--depth', '2', f'file://{repo_path}', clone_path],
+            check=True, capture_output=True
+        )
+        analyzer = CommitAnalyzer(clone_path)
+        boundary = analyzer._shallow_commits()
+
+        print("Test 10 - Shallow clone:")
+        assert len(boundary) == 1, "Clone should have one boundary commit"
+        shas = [commit.hexsha for commit in analyzer.get_commits_last_month(months=0)]
+        assert not boundary & set(analyzer._collect_numstat(shas)), \
+            "Boundary commits should get no numstat entry"
+        results = analyzer.analyze_repository(months=0, num_workers=1)
+        print(f"  Lines added: {results['Alice']['lines_added']}")
+        assert results['Alice']['commit_count'] == 2
+        assert results['Alice']['lines_added'] == 0, "Boundary commit should not count the whole tree"
+        print("  ✓ Passed\n")
+
+
+def test_early_stop_git_log():
+    """Test that history read with git log can be abandoned part-way."""
+    with tempfile.TemporaryDirectory() as repo_path:
+        _git(repo_path, 'init', '-q')
+        # More log output than a pipe buffers, so git is still writing
+        stream = ''.join(
+            f'commit refs/heads/main\ncommitter Alice <alice@example.com> {1700000000 + i} +0000\n'
+            f'data 8\ncommit {i % 10}\n'
+            for i in range(3000)
+        )
+        subprocess.run(['git', 'fast-import', '--quiet'], cwd=repo_path, input=stream.encode(),
+                       check=True, capture_output=True)
+        _git(repo_path, 'symbolic-ref', 'HEAD', 'refs/heads/main')
+        analyzer = CommitAnalyzer(repo_path)
+        # Walk history with git log, as without pygit2
+        analyzer._pygit2_checked = True
+
+        print("Test 11 - Early stop:")
+        commits = analyzer._enumerate_commit_metadata()
+        next(commits)
+        # Closing must not raise the SIGPIPE exit of the still-running git
+        commits.close()
+        assert len(analyzer.get_commits_last_month(months=0)) == 3000
+        print("  ✓ Passed\n")
+
+
+def main():
+    """Run all tests."""
+    print("="*80)
+    print("Commit Analyzer Tests")
+    print("="*80)
+    print()
+
+    test_numstat_matches_diff_counts()
+    test_numstat_rename_path()
+    test_rename_counts_match_git()
+    test_parallel_matches_sequential()
+    test_batched_analysis_matches()
+    test_vectorized_scores_match_scalar()
+    test_compiled_scores_match_scalar()
+    test_cache_reuses_results()
+    test_cache_skips_failed_analysis()
+    test_shallow_clone_boundary()
+    test_early_stop_git_log()
+
+    print("="*80)
+    print("All tests passed! ✓")
+    print("="*80)
+
+
+if __name__ == '__main__':
+    main()
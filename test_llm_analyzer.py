@@ -5,6 +5,9 @@ Test script for LLM Code Analyzer
 This script tests the LLM-based code analysis features.
 """
 
+import random
+
+import llm_code_analyzer
 from llm_code_analyzer import LLMCodeAnalyzer
 
 
@@ -158,6 +161,168 @@ def test_commit_message_verification():
     print("  ✓ Passed\n")
 
 
+def test_keyword_extraction():
+    """Test that commit message keywords are matched as whole words."""
+    analyzer = LLMCodeAnalyzer()
+    
+    print("Test 9 - Keyword extraction:")
+    keywords = analyzer._extract_keywords("Add fixture for the address tests")
+    print(f"  Keywords: {keywords}")
+    assert keywords == ['feature', 'test'], "Should not match keywords inside other words"
+    assert analyzer._extract_keywords("Fixing docs, improved speed") == ['fix', 'docs', 'optimize']
+    assert analyzer._extract_keywords("Bump version") == ['unknown']
+    print("  ✓ Passed\n")
+
+
+def test_log_scan_matches_regex():
+    """Test that the single-pass log scan finds the same lines as the regex."""
+    print("Test 10 - Log statement scan:")
+    if llm_code_analyzer.hyperscan is None:
+        print("  Hyperscan not installed, skipping\n")
+        return
+    
+    analyzer = LLMCodeAnalyzer()
+    lines = [
+        'print("Debug message")',
+        '    console.debug (value)',
+        'LOGGER.info("x")',
+        'fprintf(stderr, "%d", n)',
+        'std::cout  << value;',
+        'self.log = None',
+        'reprint(x)',
+        'print',
+        '(x)',
+        'print\x1c(x)',
+        'System.out.println("x");',
+        'x = 1',
+    ]
+    found = llm_code_analyzer._find_log_lines(lines)
+    expected = {i for i, line in enumerate(lines) if analyzer._is_print_or_log(line.strip())}
+    print(f"  Log lines: {sorted(found)}")
+    assert found == expected, "Scan should match the per-line regex"
+    assert llm_code_analyzer._find_log_lines(['prınt(x)']) is None, "Non-ASCII text uses the regex"
+    print("  ✓ Passed\n")
+
+
+def test_compiled_classifier_matches():
+    """Test that the compiled classifier counts the same line classes."""
+    print("Test 11 - Compiled classifier:")
+    if llm_code_analyzer._compiled_classifier is None:
+        print("  Classifier not built, skipping\n")
+        return
+    
+    analyzer = LLMCodeAnalyzer()
+    lines = [
+        '', '   ', '# comment', '  // comment', '/* block', ' * block', '<!-- html -->',
+        '"""Docstring"""', "'''Docstring'''", '\x1c# separator', 'print("x")', 'PRINT (x)',
+        'reprint(x)', 'print', 'console.warn (x)', 'console.trace(x)', 'LOG.info', 'std::cout<< x;',
+        'System.err.println(x)', 'x = 1', '1 = 2', '3(', '42', '}', ');', 'é = 1', 'conſole.log(x)',
+    ]
+    expected = [0, 0, 0]
+    for line in lines:
+        line_class = analyzer._classify_line(line)
+        for i, bit in enumerate((1, 2, 4)):
+            expected[i] += line_class == bit
+    counts = llm_code_analyzer._compiled_classifier.count_line_classes(
+        lines, analyzer._classify_line, llm_code_analyzer._line_contents
+    )
+    print(f"  Counts: {counts}")
+    assert counts[:3] == tuple(expected), "Compiled counts should match the Python classifier"
+    
+    # Content bits, including the trailing whitespace analyze_change_type strips
+    for line in ['def f():', '  class A:', 'import os', 'undef ', 'x = TestCase()', 'ASSERT(x)',
+                 'from x import y', 'function  ', 'DEF f', '# class comment', 'é def é']:
+        compiled = llm_code_analyzer._compiled_classifier.count_line_classes(
+            [line], analyzer._classify_line, llm_code_analyzer._line_contents
+        )[3]
+        assert compiled == llm_code_analyzer._line_contents(line), \
+            f"Content bits should match for {line!r}"
+    print("  ✓ Passed\n")
+
+
+def test_compiled_classifier_against_regexes():
+    """Test the compiled classifier against the regexes on generated lines."""
+    print("Test 12 - Compiled classifier against the regexes:")
+    try:
+        import classifier
+    except ImportError:
+        print("  Classifier not built, skipping\n")
+        return
+    assert classifier.PATTERNS_HASH == llm_code_analyzer._patterns_hash(), \
+        "classifier.pyx implements other patterns than llm_code_analyzer"
+    
+    def regex_class(line):
+        line = line.lstrip()
+        if not line:
+            return 0
+        if line.startswith(llm_code_analyzer._COMMENT_PREFIXES):
+            return llm_code_analyzer._LINE_COMMENT
+        if llm_code_analyzer._LOG_RE.search(line):
+            return llm_code_analyzer._LINE_LOG
+        if llm_code_analyzer._LOGICAL_RE.search(line):
+            return llm_code_analyzer._LINE_LOGICAL
+        return 0
+    
+    # Lines built from the words, symbols and separators the patterns use
+    tokens = [
+        'print', 'printf', 'fprintf', 'cout', 'cerr', 'console', 'log', 'debug', 'info',
+        'warn', 'error', 'logger', 'logging', 'Log', 'System', 'out', 'err', 'def', 'function',
+        'class', 'if', 'else', 'for', 'while', 'return', 'import', 'from', 'await', 'async',
+        'try', 'except', 'catch', 'throw', 'raise', 'test', 'assert', 'x', '_', '7',
+        '.', '(', ')', '<<', '<', '=', ':', '#', '//', '/', '/*', '*', '<!--', '"""', "'''",
+        '"', "'", '-', ' ', '  ', '\t', '\x0b', '\x1c', '\x1f',
+    ]
+    rng = random.Random(0)
+    lines = []
+    for _ in range(20000):
+        words = [rng.choice(tokens) for _ in range(rng.randint(1, 8))]
+        words = [word.upper() if rng.random() < 0.2 else word for word in words]
+        lines.append(''.join(word + rng.choice(('', '', ' ', '\t')) for word in words))
+    
+    classes = bytearray(len(lines))
+    classifier.classify_lines(lines, regex_class, memoryview(classes))
+    for line, line_class in zip(lines, classes):
+        assert line_class == regex_class(line), f"Class should match the regexes for {line!r}"
+        contents = classifier.count_line_classes([line], regex_class, llm_code_analyzer._line_contents)[3]
+        assert contents == llm_code_analyzer._line_contents(line), \
+            f"Content bits should match for {line!r}"
+    print(f"  Lines checked: {len(lines)}")
+    print("  ✓ Passed\n")
+
+
+def test_batch_matches_single():
+    """Test that batch analysis gives the same scores as one diff at a time."""
+    print("Test 13 - Batch analysis:")
+    analyzer = LLMCodeAnalyzer()
+    diffs = [
+        "+    def f(x):\n+        # Square x\n+        print(x)\n+        return x * x\n",
+        "+# Only a comment\n",
+        "-removed = 1\n",
+        "+print('debug')\n+console.log(x)\n+y = 1\n",
+        "-removed = 1\n+\n",
+        "",
+    ]
+    batch = analyzer.analyze_batch(diffs)
+    for row, diff_text in enumerate(diffs):
+        expected = analyzer.analyze_code_impact(diff_text)
+        actual = {key: float(values[row]) for key, values in batch.items()}
+        print(f"  Diff {row}: {actual}")
+        assert actual == expected, "Batch scores should match analyze_code_impact"
+    print("  ✓ Passed\n")
+
+
+def test_diff_contents_found():
+    """Test that every content is found wherever it appears in a diff."""
+    print("Test 14 - Diff contents:")
+    facts = llm_code_analyzer._parse_diff_cached(
+        "+class A:\n+    def test_a(self):\n+        pass\n+import os\n"
+    )
+    print(f"  Facts: {facts}")
+    assert facts.has_class_def and facts.has_function_def and facts.has_tests
+    assert facts.has_import, "Imports after the other contents should be found"
+    print("  ✓ Passed\n")
+
+
 def main():
     """Run all tests."""
     print("="*80)
@@ -173,6 +338,27 @@ def main():
     print("-"*80)
     test_commit_message_verification()
     
+    print("Testing Keyword Extraction:")
+    print("-"*80)
+    test_keyword_extraction()
+    
+    print("Testing Log Statement Scan:")
+    print("-"*80)
+    test_log_scan_matches_regex()
+    
+    print("Testing Compiled Classifier:")
+    print("-"*80)
+    test_compiled_classifier_matches()
+    test_compiled_classifier_against_regexes()
+    
+    print("Testing Batch Analysis:")
+    print("-"*80)
+    test_batch_matches_single()
+    
+    print("Testing Diff Contents:")
+    print("-"*80)
+    test_diff_contents_found()
+    
     print("="*80)
     print("All tests passed! ✓")
     print("="*80)